@@ -3,8 +3,9 @@ Evaluator for comparing agent output with SWDE groundtruth
 """
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from .groundtruth_loader import GroundtruthLoader
 from .metrics import ExtractionMetrics
 
@@ -12,15 +13,18 @@ from .metrics import ExtractionMetrics
 class SWDEEvaluator:
     """Evaluates agent output against SWDE groundtruth."""
 
-    def __init__(self, groundtruth_dir: str):
+    def __init__(self, groundtruth_dir: str, gt_cache_path: Optional[Path] = None, parallel_pages: bool = True):
         """
         Initialize the evaluator.
 
         Args:
             groundtruth_dir: Path to groundtruth directory
+            gt_cache_path: Optional pickle file caching parsed groundtruth across runs
+            parallel_pages: Load and evaluate the pages of a website on a thread pool
         """
-        self.gt_loader = GroundtruthLoader(groundtruth_dir)
+        self.gt_loader = GroundtruthLoader(groundtruth_dir, cache_path=gt_cache_path)
         self.metrics_computer = ExtractionMetrics()
+        self.parallel_pages = parallel_pages
 
     def load_agent_output(self, output_file: Path) -> Optional[Dict[str, Any]]:
         """
@@ -69,43 +73,62 @@ class SWDEEvaluator:
         collect_values(json_data)
         return values
 
-    def extract_matching_values(self, json_data: Dict[str, Any], groundtruth_values: List[str]) -> List[str]:
+    def normalize_json_values(self, json_data: Dict[str, Any]) -> List[Tuple[str, str]]:
         """
-        Extract values from JSON that match any of the groundtruth values.
-        Uses value-based matching instead of key-based matching.
+        Extract all values from JSON data and normalize each of them once.
 
         Args:
             json_data: Parsed JSON data
+
+        Returns:
+            List of (raw value, normalized value) pairs
+        """
+        return [
+            (value, ExtractionMetrics.normalize_value(value))
+            for value in self.extract_all_values_from_json(json_data)
+        ]
+
+    @staticmethod
+    def _match_normalized_values(json_values: List[Tuple[str, str]], groundtruth_values: List[str]) -> List[str]:
+        """
+        Select the JSON values whose normalized form matches a groundtruth value.
+
+        Args:
+            json_values: (raw, normalized) pairs from normalize_json_values()
             groundtruth_values: List of groundtruth values to search for
 
         Returns:
-            List of unique values from JSON that match groundtruth (for precision calculation)
+            List of unique raw values that match groundtruth
         """
-        # Extract all values from JSON
-        all_json_values = self.extract_all_values_from_json(json_data)
+        # Same semantics as ExtractionMetrics.value_match(): empty values never match
+        gt_normalized = {ExtractionMetrics.normalize_value(gt) for gt in groundtruth_values if gt}
+        gt_normalized.discard("")
 
-        # Find which JSON values match any groundtruth value
-        from .metrics import ExtractionMetrics
         matching_values = []
         seen_values = set()  # Track seen values to avoid duplicates
-
-        for json_val in all_json_values:
-            # Normalize value for duplicate detection
-            normalized = ExtractionMetrics.normalize_value(json_val)
-
-            # Skip if we've already seen this value
+        for raw, normalized in json_values:
             if normalized in seen_values:
                 continue
-
-            # Check if this value matches any groundtruth
-            for gt_val in groundtruth_values:
-                if ExtractionMetrics.value_match(json_val, gt_val):
-                    matching_values.append(json_val)
-                    seen_values.add(normalized)
-                    break  # Don't check other groundtruth values
+            if normalized in gt_normalized:
+                matching_values.append(raw)
+                seen_values.add(normalized)
 
         return matching_values
 
+    def extract_matching_values(self, json_data: Dict[str, Any], groundtruth_values: List[str]) -> List[str]:
+        """
+        Extract values from JSON that match any of the groundtruth values.
+        Uses value-based matching instead of key-based matching.
+
+        Args:
+            json_data: Parsed JSON data
+            groundtruth_values: List of groundtruth values to search for
+
+        Returns:
+            List of unique values from JSON that match groundtruth (for precision calculation)
+        """
+        return self._match_normalized_values(self.normalize_json_values(json_data), groundtruth_values)
+
     def extract_values_from_json(self, json_data: Dict[str, Any], attribute: str) -> List[str]:
         """
         Extract values for a specific attribute from JSON data.
@@ -210,6 +233,9 @@ class SWDEEvaluator:
         field_metrics = {}
         field_details = {}
 
+        # Normalize the agent output once for all attributes
+        json_values = self.normalize_json_values(agent_output)
+
         for attribute in attributes:
             # Get groundtruth
             gt_values = self.gt_loader.get_groundtruth(vertical, website, page_id, attribute)
@@ -218,7 +244,7 @@ class SWDEEvaluator:
             raw_extracted = self._extract_by_key(agent_output, attribute)
 
             # Extract matching values from agent output (value-based matching)
-            extracted_values = self.extract_matching_values(agent_output, gt_values)
+            extracted_values = self._match_normalized_values(json_values, gt_values)
 
             # Compute metrics
             metrics = self.metrics_computer.compute_field_metrics(extracted_values, gt_values)
@@ -238,6 +264,45 @@ class SWDEEvaluator:
             'field_details': field_details
         }
 
+    def _load_and_evaluate_page(
+        self,
+        vertical: str,
+        website: str,
+        page_id: str,
+        output_dir: Path
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, str]]]:
+        """
+        Load the agent output of a page and evaluate it.
+
+        Args:
+            vertical: Vertical name
+            website: Website name
+            page_id: Page ID
+            output_dir: Directory containing agent output JSON files
+
+        Returns:
+            (page result, None) on success, otherwise (None, error entry)
+        """
+        # Look for agent output file
+        json_file = output_dir / f"{page_id}.json"
+
+        if not json_file.exists():
+            return None, {
+                'page_id': page_id,
+                'error': 'Output file not found'
+            }
+
+        # Load agent output
+        agent_output = self.load_agent_output(json_file)
+        if agent_output is None:
+            return None, {
+                'page_id': page_id,
+                'error': 'Failed to parse JSON'
+            }
+
+        # Evaluate this page
+        return self.evaluate_page(vertical, website, page_id, agent_output), None
+
     def evaluate_website(
         self,
         vertical: str,
@@ -262,29 +327,22 @@ class SWDEEvaluator:
         page_results = []
         errors = []
 
-        for page_id in sorted(page_ids):
-            # Look for agent output file
-            json_file = output_dir / f"{page_id}.json"
-
-            if not json_file.exists():
-                errors.append({
-                    'page_id': page_id,
-                    'error': 'Output file not found'
-                })
-                continue
-
-            # Load agent output
-            agent_output = self.load_agent_output(json_file)
-            if agent_output is None:
-                errors.append({
-                    'page_id': page_id,
-                    'error': 'Failed to parse JSON'
-                })
-                continue
-
-            # Evaluate this page
-            page_result = self.evaluate_page(vertical, website, page_id, agent_output)
-            page_results.append(page_result)
+        def load_and_evaluate(page_id):
+            return self._load_and_evaluate_page(vertical, website, page_id, output_dir)
+
+        # Page evaluation is dominated by reading the agent output files
+        sorted_page_ids = sorted(page_ids)
+        if self.parallel_pages and len(sorted_page_ids) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(sorted_page_ids))) as executor:
+                outcomes = list(executor.map(load_and_evaluate, sorted_page_ids))
+        else:
+            outcomes = [load_and_evaluate(page_id) for page_id in sorted_page_ids]
+
+        for page_result, error in outcomes:
+            if error is not None:
+                errors.append(error)
+            else:
+                page_results.append(page_result)
 
         # Aggregate metrics
         attribute_metrics = self.metrics_computer.compute_attribute_level_metrics(page_results)
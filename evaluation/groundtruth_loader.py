@@ -5,23 +5,95 @@ This module loads and parses groundtruth files from the SWDE dataset.
 """
 
 import os
+import pickle
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from collections import defaultdict
 
 
 class GroundtruthLoader:
     """Loads groundtruth data from SWDE dataset."""
 
-    def __init__(self, groundtruth_dir: str):
+    def __init__(self, groundtruth_dir: str, cache_path: Optional[Path] = None):
         """
         Initialize the groundtruth loader.
 
         Args:
             groundtruth_dir: Path to the groundtruth directory
+            cache_path: Optional pickle file caching parsed groundtruth files across runs
         """
         self.groundtruth_dir = Path(groundtruth_dir)
         self.data = defaultdict(lambda: defaultdict(dict))
+        self._loaded_verticals = set()
+
+        # Parsed files keyed by path, validated against (mtime_ns, size)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._file_cache = self._load_cache()
+        self._cache_dirty = False
+
+    def _load_cache(self) -> Dict[str, Tuple[Tuple[int, int], Dict[str, List[str]]]]:
+        """
+        Load the on-disk groundtruth cache.
+
+        Returns:
+            Cache dictionary (empty if there is no usable cache file)
+        """
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cache = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable groundtruth cache {self.cache_path}: {e}")
+            return {}
+
+        return cache if isinstance(cache, dict) else {}
+
+    def save_cache(self) -> None:
+        """
+        Persist the groundtruth cache if files were parsed since it was loaded.
+
+        Several processes (e.g. --jobs workers, one per vertical) may share the
+        cache file, so entries written by others since it was loaded are merged
+        in first instead of being overwritten.
+        """
+        if self.cache_path is None or not self._cache_dirty:
+            return
+
+        merged = self._load_cache()
+        merged.update(self._file_cache)
+        self._file_cache = merged
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self._file_cache, f, protocol=5)
+        os.replace(tmp_path, self.cache_path)
+        self._cache_dirty = False
+
+    def _load_groundtruth_file_cached(self, filepath: Path) -> Dict[str, List[str]]:
+        """
+        Load a groundtruth file, reusing the cached parse if the file is unchanged.
+
+        Args:
+            filepath: Path to the groundtruth file
+
+        Returns:
+            Dictionary mapping page_id to list of attribute values
+        """
+        stat = filepath.stat()
+        key = str(filepath)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._file_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        result = self.load_groundtruth_file(filepath)
+        self._file_cache[key] = (signature, result)
+        self._cache_dirty = True
+        return result
 
     def load_groundtruth_file(self, filepath: Path) -> Dict[str, List[str]]:
         """
@@ -63,9 +135,14 @@ class GroundtruthLoader:
         """
         Load all groundtruth files for a specific vertical.
 
+        Verticals that were already loaded by this loader are not parsed again.
+
         Args:
             vertical: Name of the vertical (e.g., 'book', 'movie')
         """
+        if vertical in self._loaded_verticals:
+            return
+
         vertical_dir = self.groundtruth_dir / vertical
 
         if not vertical_dir.exists():
@@ -83,9 +160,11 @@ class GroundtruthLoader:
             attribute = '-'.join(parts[2:])  # Handle attributes with hyphens
 
             # Load the groundtruth data
-            gt_data = self.load_groundtruth_file(gt_file)
+            gt_data = self._load_groundtruth_file_cached(gt_file)
             self.data[vertical][website][attribute] = gt_data
 
+        self._loaded_verticals.add(vertical)
+
     def get_groundtruth(self, vertical: str, website: str, page_id: str, attribute: str) -> List[str]:
         """
         Get groundtruth values for a specific page and attribute.
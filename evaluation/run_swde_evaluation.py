@@ -5,15 +5,36 @@ This script runs the web2json agent on SWDE dataset and evaluates the results.
 """
 
 import os
+import re
 import sys
+import atexit
+import signal
 import argparse
 import subprocess
+import queue
+import threading
+import multiprocessing
+import itertools
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple
 import json
+import hashlib
 from datetime import datetime
+from functools import lru_cache
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; summary log appends are then unlocked
+    fcntl = None
+
 # Force change working directory to project root (fix IDE working directory issue)
 project_root = Path(__file__).parent.parent
 if Path.cwd() != project_root:
@@ -23,10 +44,8 @@ if Path.cwd() != project_root:
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from evaluation.evaluator import SWDEEvaluator
-from evaluation.visualization import EvaluationReporter
-from evaluation.schema_generator import SchemaGenerator
-from web2json.config.settings import settings
+# The evaluator, reporter (matplotlib), schema generator and settings are imported
+# where they are used, so --help and runs that skip those stages do not pay for them
 
 
 # SWDE dataset configuration
@@ -41,6 +60,12 @@ VERTICALS = {
     'university': ['collegeboard', 'collegenavigator', 'collegetoolkit', 'embark', 'matchcollege', 'princetonreview', 'studentaid', 'usnews', 'ecampustours', 'collegeprowler']
 }
 
+VERTICAL_SIZES = {vertical: len(websites) for vertical, websites in VERTICALS.items()}
+
+# Flat list of every (vertical, website) pair, in evaluation order
+WORK_PLAN = [(vertical, website) for vertical, websites in VERTICALS.items() for website in websites]
+TOTAL_SITES = len(WORK_PLAN)
+
 ATTRIBUTES = {
     'auto': ['model', 'price', 'engine', 'fuel_economy'],
     'book': ['title', 'author', 'isbn_13', 'publisher', 'publication_date'],
@@ -52,6 +77,253 @@ ATTRIBUTES = {
     'university': ['name', 'phone', 'website', 'type']
 }
 
+METRIC_KEYS = ('precision', 'recall', 'f1')
+
+# Files written by EvaluationReporter into <output_root>/<vertical>/<website>/evaluation/
+REPORT_FILE = "results.json"
+REPORT_SUMMARY_FILE = "evaluation_summary.json"
+
+# Append-only log of per-website summary entries in <output_root>/
+SUMMARY_LOG_FILE = "summary.jsonl"
+
+# Parsed groundtruth cache in <output_root>/, reused across runs for unchanged files
+GT_CACHE_FILE = ".gt_cache.pkl"
+
+# Dataset HTML directory names: <vertical>-<website> or <vertical>-<website>(<page count>)
+HTML_DIR_PATTERN = re.compile(r'^(?P<vertical>[^-]+)-(?P<website>[^(]+)(\(.*\))?$')
+
+
+def _read_json(path) -> Dict:
+    """Read a JSON file, using orjson when available."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(path, data: Dict) -> None:
+    """
+    Atomically write a JSON file (indented, UTF-8), using orjson when available.
+
+    The data is written to a sibling .tmp file which then replaces the target,
+    so an interrupted run never leaves a truncated file behind.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if orjson is not None:
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            f.flush()
+            os.fsync(f.fileno())
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _write_banner(lines: List[str]) -> None:
+    """Write a multi-line banner in one write, so it is not interleaved with other output."""
+    tqdm.write("\n".join(lines))
+
+
+def _results_digest(results: List[Dict]) -> str:
+    """Content hash of evaluation results, independent of key order."""
+    if orjson is not None:
+        payload = orjson.dumps(results, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    else:
+        payload = json.dumps(results, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _generate_integrated_report(results: List[Dict], output_file: Path) -> None:
+    """
+    Generate an integrated error report unless the existing one was built from the same results.
+
+    The digest of the results is kept in a sidecar file next to the report.
+
+    Args:
+        results: Evaluation results of the websites in the report
+        output_file: Path of the HTML report
+    """
+    digest = _results_digest(results)
+    digest_file = output_file.with_suffix('.hash')
+    if output_file.exists() and digest_file.exists() and digest_file.read_text(encoding='utf-8') == digest:
+        tqdm.write(f"Report up-to-date: {output_file}")
+        return
+
+    from evaluation.visualization import EvaluationReporter
+    EvaluationReporter.generate_integrated_report(results, output_file)
+    digest_file.write_text(digest, encoding='utf-8')
+
+
+def _log_vertical_error(output_root: Path, vertical: str, error: BaseException) -> None:
+    """
+    Write the traceback of a failed vertical to <output_root>/<vertical>/error.log.
+
+    Only a one-line message goes to the console, so failures of parallel
+    verticals do not interleave full stacks.
+
+    Args:
+        output_root: Root directory for outputs
+        vertical: Vertical name
+        error: The raised exception
+    """
+    import traceback
+
+    error_log = output_root / vertical / "error.log"
+    error_log.parent.mkdir(parents=True, exist_ok=True)
+    error_log.write_text("".join(traceback.format_exception(error)), encoding='utf-8')
+    tqdm.write(f"[{vertical}] FAILED: {error} (see {error_log})")
+
+
+def _list_subdirs(path) -> List[os.DirEntry]:
+    """List subdirectory entries of a path (empty if it does not exist)."""
+    try:
+        with os.scandir(path) as it:
+            return [entry for entry in it if entry.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+@lru_cache(maxsize=None)
+def _list_html_files(html_dir: str, mtime: float) -> Tuple[str, ...]:
+    """
+    List the HTML files of a dataset directory in sorted order.
+
+    The directory mtime is part of the cache key, so entries are invalidated
+    when files are added to or removed from the directory.
+
+    Args:
+        html_dir: HTML directory
+        mtime: Modification time of html_dir
+
+    Returns:
+        Sorted tuple of HTML file paths
+    """
+    return tuple(sorted(str(f) for f in Path(html_dir).glob("*.htm*")))
+
+
+def _agent_worker_main(jobs, results) -> None:
+    """
+    Agent worker process: import the agent stack once, then run jobs until a None sentinel.
+
+    Each job is (job_id, html_dir, output_dir, domain) and runs the same agent
+    invocation as `python -m web2json.main -d <html_dir> -o <output_dir> --domain <domain>`.
+    """
+    try:
+        from web2json.main import setup_logger, read_html_files_from_directory
+        from web2json.agent import ParserAgent
+        setup_logger()
+        import_error = None
+    except Exception as e:
+        # Fail each job instead of dying, so callers are not left waiting
+        import_error = f"Failed to import agent: {e}"
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+
+        job_id, html_dir, output_dir, domain = job
+        if import_error is not None:
+            results.put((job_id, {'success': False, 'error': import_error}))
+            continue
+        try:
+            html_files = read_html_files_from_directory(html_dir)
+            agent = ParserAgent(output_dir=output_dir)
+            result = agent.generate_parser(html_files=html_files, domain=domain, iteration_rounds=3)
+            results.put((job_id, {'success': bool(result.get('success')), 'error': result.get('error')}))
+        except (Exception, SystemExit) as e:
+            # read_html_files_from_directory exits on unreadable directories
+            results.put((job_id, {'success': False, 'error': str(e) or type(e).__name__}))
+
+
+class AgentWorkerPool:
+    """Long-lived agent worker processes, so each website does not pay interpreter and import startup."""
+
+    def __init__(self, num_workers: int):
+        """
+        Start the agent worker processes.
+
+        Args:
+            num_workers: Number of worker processes
+        """
+        # spawn: the runner holds threads and locks that must not be forked
+        ctx = multiprocessing.get_context('spawn')
+        self._jobs = ctx.Queue()
+        self._results = ctx.Queue()
+        self._pending: Dict[int, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._job_ids = itertools.count()
+
+        self._workers = [
+            ctx.Process(target=_agent_worker_main, args=(self._jobs, self._results), daemon=True)
+            for _ in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+        # Hands finished jobs back to the threads waiting on their futures
+        self._collector = threading.Thread(target=self._collect_results, daemon=True)
+        self._collector.start()
+
+    def _collect_results(self) -> None:
+        while True:
+            item = self._results.get()
+            if item is None:
+                break
+            job_id, result = item
+            with self._pending_lock:
+                future = self._pending.pop(job_id, None)
+            if future is not None:
+                future.set_result(result)
+
+    def submit(self, html_dir: str, output_dir: str, domain: str) -> Future:
+        """
+        Queue an agent run.
+
+        Args:
+            html_dir: Directory of HTML files
+            output_dir: Agent output directory
+            domain: Website name passed to the agent as its domain
+
+        Returns:
+            Future resolving to {'success': bool, 'error': Optional[str]}
+        """
+        future = Future()
+        job_id = next(self._job_ids)
+        with self._pending_lock:
+            self._pending[job_id] = future
+        self._jobs.put((job_id, html_dir, output_dir, domain))
+        return future
+
+    def shutdown(self, grace_period: float = 5) -> None:
+        """
+        Stop the workers, terminating any that are still busy after the grace period.
+
+        Args:
+            grace_period: Seconds to wait for each worker to exit
+        """
+        for _ in self._workers:
+            self._jobs.put(None)
+        for worker in self._workers:
+            worker.join(timeout=grace_period)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+
+        self._results.put(None)
+        self._collector.join()
+
+        with self._pending_lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            future.set_exception(RuntimeError("Agent worker pool shut down"))
+
 
 class SWDEEvaluationRunner:
     """Runs the complete SWDE evaluation pipeline."""
@@ -66,7 +338,15 @@ class SWDEEvaluationRunner:
         skip_agent: bool = False,
         skip_evaluation: bool = False,
         force: bool = False,
-        use_predefined_schema: bool = False
+        use_predefined_schema: bool = False,
+        max_parallel: int = 1,
+        agent_workers: int = 0,
+        parallel_pages: bool = True,
+        chart_format: str = 'png',
+        pretty_json: bool = True,
+        total_sites: Optional[int] = None,
+        persist_summary: bool = True,
+        show_progress: bool = True
     ):
         """
         Initialize the evaluation runner.
@@ -81,6 +361,19 @@ class SWDEEvaluationRunner:
             skip_evaluation: Skip evaluation if report already exists
             force: Force re-run everything (overrides resume/skip options)
             use_predefined_schema: Use predefined schema templates from groundtruth
+            max_parallel: Maximum number of websites processed concurrently
+            agent_workers: Number of persistent agent worker processes used instead of
+                one `python -m web2json.main` subprocess per website (0 = subprocesses;
+                only applies without predefined schemas)
+            parallel_pages: Load and evaluate the pages of a website on a thread pool
+            chart_format: Image format of the per-website evaluation charts (png, webp or svg)
+            pretty_json: Write results.json indented (default) instead of compact
+            total_sites: Number of websites this run covers, for the progress bar
+                (defaults to all SWDE websites)
+            persist_summary: Write the global summary to summary.json (disabled for
+                worker processes, whose vertical entries are merged by the parent)
+            show_progress: Show the progress bar (disabled for worker processes, whose
+                progress is reported by the parent)
         """
         self.dataset_dir = Path(dataset_dir)
         self.groundtruth_dir = Path(groundtruth_dir)
@@ -91,67 +384,361 @@ class SWDEEvaluationRunner:
         self.skip_evaluation = skip_evaluation and not force
         self.force = force
         self.use_predefined_schema = use_predefined_schema
+        self.max_parallel = max(1, max_parallel)
+        self.agent_workers = max(0, agent_workers)
+        self.parallel_pages = parallel_pages
+        self.chart_format = chart_format
+        self.pretty_json = pretty_json
+        self.persist_summary = persist_summary
+
+        # Guards self.global_summary and summary.json when websites run concurrently.
+        # Re-entrant so the SIGTERM flush can run while the main thread holds it.
+        self._summary_lock = threading.RLock()
 
         self.output_root.mkdir(parents=True, exist_ok=True)
 
-        # Global summary file path
+        # Single progress bar for the whole run; per-site messages go through tqdm.write
+        if total_sites is None:
+            total_sites = TOTAL_SITES
+        self._pbar = tqdm(total=total_sites, desc='SWDE', unit='site', disable=not show_progress)
+
+        # Index of dataset HTML directories, built with one scan of dataset_dir
+        self._html_dirs = self._build_html_dir_index()
+
+        # Snapshot of existing outputs, used by the completion checks instead of
+        # globbing every website directory. Each vertical directory is scanned once,
+        # on first use, so single-vertical runs never walk the other verticals.
+        self._fs_index = {}
+        self._scanned_verticals = set()
+        self._fs_index_lock = threading.Lock()
+
+        # (vertical, website) pairs still to run, set by plan_resume(); None until a plan is made
+        self._pending: Optional[Set[Tuple[str, str]]] = None
+
+        # Directories known to exist, so _ensure_dir skips the mkdir syscalls
+        self._mkdir_done = {str(self.output_root)}
+
+        # Global summary file path, and the append-only log of per-website entries
         self.global_summary_file = self.output_root / "summary.json"
+        self.summary_log_file = self.output_root / SUMMARY_LOG_FILE
 
         # Load or initialize global summary
+        summary_exists = any(
+            path.exists() for path in (self.global_summary_file, self.global_summary_file.with_suffix('.json.tmp'))
+        )
         self.global_summary = self._load_global_summary()
 
+        # Running metric sums so each update is O(1) instead of re-summing every website
+        self._overall_sums = self._init_summary_sums()
+
+        # Each website entry is appended to summary.jsonl as it completes;
+        # summary.json itself is only rewritten at vertical boundaries and exit,
+        # and each write drops the log entries it folded in.
+        # Entries logged after the last summary.json write are replayed here.
+        self._summary_log = None
+        self._dirty_count = 0
+        if summary_exists:
+            self._dirty_count = self._replay_summary_log()
+        elif self.persist_summary:
+            # Without summary.json any log is left over from an earlier run: start fresh,
+            # and write the empty summary so entries logged from now on are replayed after a crash
+            self.summary_log_file.unlink(missing_ok=True)
+            self._save_global_summary()
+        atexit.register(self.flush_global_summary)
+
+        # Agent subprocesses still running; terminated at exit so an interrupted
+        # run does not leave agents (and their LLM calls) behind
+        self._agent_procs = set()
+        self._agent_procs_lock = threading.Lock()
+        # Set once the run is being interrupted; no new agents are started after that
+        self._stopping = threading.Event()
+        atexit.register(self.terminate_agent_processes)
+
+        # Persistent agent workers, started on first use
+        self._agent_pool: Optional[AgentWorkerPool] = None
+        self._agent_pool_lock = threading.Lock()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._handle_sigterm)
+
+        # Shared evaluator, created on first use (see the evaluator property)
+        self._evaluator = None
+        self._evaluator_lock = threading.Lock()
+        atexit.register(self._save_groundtruth_cache)
+
+        # Background workers for the evaluation stage, so evaluating one website
+        # overlaps with running the agent on the next one (see run_vertical)
+        self._eval_executor = ThreadPoolExecutor(max_workers=2)
+
+        # Small LRU of evaluation results produced or loaded in this process,
+        # so a report is not parsed back from disk right after it was written
+        self._report_cache = OrderedDict()
+        self._report_cache_size = 32
+
         # Initialize schema generator and schema paths
         self.schema_generator = None
         self.schema_paths = {}
+        self._schema_cache = {}
         if self.use_predefined_schema:
             self._initialize_schemas()
 
+    @property
+    def evaluator(self):
+        """
+        Shared SWDEEvaluator, so groundtruth is parsed once per vertical, not once per website.
+
+        Created on first use, so runs that never evaluate skip importing and loading it.
+        Parsed groundtruth is also cached on disk so later runs skip unchanged files.
+        """
+        with self._evaluator_lock:
+            if self._evaluator is None:
+                from evaluation.evaluator import SWDEEvaluator
+                self._evaluator = SWDEEvaluator(
+                    str(self.groundtruth_dir),
+                    gt_cache_path=self.output_root / GT_CACHE_FILE,
+                    parallel_pages=self.parallel_pages
+                )
+            return self._evaluator
+
+    def _save_groundtruth_cache(self) -> None:
+        """Persist the evaluator's groundtruth cache, if the evaluator was used."""
+        if self._evaluator is not None:
+            self._evaluator.gt_loader.save_cache()
+
     def _initialize_schemas(self) -> None:
         """Initialize schema generator and generate schema templates."""
-        print("\n" + "="*80)
-        print("Initializing Predefined Schema Templates from Groundtruth")
-        print("="*80)
-
-        self.schema_generator = SchemaGenerator(str(self.groundtruth_dir))
+        tqdm.write("\n" + "="*80)
+        tqdm.write("Initializing Predefined Schema Templates from Groundtruth")
+        tqdm.write("="*80)
 
         # Generate schemas for all verticals and websites
         schema_output_dir = self.output_root / "_schemas"
-        schema_output_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(schema_output_dir)
+        schemas_index_file = schema_output_dir / "schemas_index.json"
+
+        # Reuse the templates of a previous run unless forced to regenerate
+        if not self.force and schemas_index_file.exists():
+            schemas_index = _read_json(schemas_index_file)
+            schema_paths = {
+                vertical: {website: Path(path) for website, path in websites.items()}
+                for vertical, websites in schemas_index.items()
+            }
+            if all(path.exists() for websites in schema_paths.values() for path in websites.values()):
+                tqdm.write(f"Reusing schema templates from: {schemas_index_file}")
+                self.schema_paths = schema_paths
+                return
 
-        print(f"Generating schema templates to: {schema_output_dir}")
+        tqdm.write(f"Generating schema templates to: {schema_output_dir}")
+        from evaluation.schema_generator import SchemaGenerator
+        self.schema_generator = SchemaGenerator(str(self.groundtruth_dir))
         self.schema_paths = self.schema_generator.generate_all_schemas(
             verticals=VERTICALS,
             output_dir=schema_output_dir,
             sample_count=5
         )
 
-        print("="*80)
-        print(f"✓ Schema templates generated successfully")
-        print("="*80 + "\n")
+        _write_json(schemas_index_file, {
+            vertical: {website: str(path) for website, path in websites.items()}
+            for vertical, websites in self.schema_paths.items()
+        })
+
+        tqdm.write("="*80)
+        tqdm.write(f"✓ Schema templates generated successfully")
+        tqdm.write("="*80 + "\n")
 
     def _load_global_summary(self) -> Dict:
         """Load or initialize the global summary."""
-        if self.global_summary_file.exists():
-            with open(self.global_summary_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            return {
-                'timestamp': datetime.now().isoformat(),
-                'verticals': {},
-                'overall': {
-                    'total_websites': 0,
-                    'completed_websites': 0,
-                    'precision': 0.0,
-                    'recall': 0.0,
-                    'f1': 0.0
-                }
+        # Fall back to the temp file of an interrupted save if the summary is unreadable
+        tmp_file = self.global_summary_file.with_suffix('.json.tmp')
+        for summary_file in (self.global_summary_file, tmp_file):
+            if not summary_file.exists():
+                continue
+            try:
+                return _read_json(summary_file)
+            except json.JSONDecodeError as e:
+                tqdm.write(f"⚠️  Failed to parse {summary_file}, ignoring it: {e}")
+
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'verticals': {},
+            'overall': {
+                'total_websites': 0,
+                'completed_websites': 0,
+                'precision': 0.0,
+                'recall': 0.0,
+                'f1': 0.0
             }
+        }
+
+    def _replay_summary_log(self) -> int:
+        """
+        Apply the logged website entries not yet reflected in the loaded global summary.
+
+        Returns:
+            Number of replayed entries
+        """
+        if not self.summary_log_file.exists():
+            return 0
+
+        replayed = 0
+        with open(self.summary_log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn last line of an interrupted append
+                    continue
+                if self._is_folded_log_record(record):
+                    continue
+                vertical = record.pop('vertical')
+                website = record.pop('website')
+                self._apply_website_entry(vertical, website, record)
+                self.global_summary['timestamp'] = max(self.global_summary['timestamp'], record['timestamp'])
+                replayed += 1
+
+        if replayed:
+            self._refresh_overall_metrics()
+            tqdm.write(f"Replayed {replayed} website entries from {self.summary_log_file}")
+        return replayed
+
+    def _is_folded_log_record(self, record: Dict) -> bool:
+        """Check whether a summary.jsonl record is already reflected in the global summary."""
+        vertical_data = self.global_summary['verticals'].get(record['vertical'])
+        entry = vertical_data['websites'].get(record['website']) if vertical_data else None
+        return entry is not None and entry.get('timestamp', '') >= record['timestamp']
+
+    def _compact_summary_log(self) -> None:
+        """
+        Drop the summary.jsonl records folded into the global summary; caller must hold the lock.
+
+        Runs right after summary.json is written, under the same flock as the appends.
+        Records not reflected in the summary yet (e.g. appended by --jobs workers whose
+        vertical has not been merged) are kept, torn lines of interrupted appends are dropped.
+        """
+        try:
+            f = open(self.summary_log_file, 'r+', encoding='utf-8')
+        except FileNotFoundError:
+            return
+
+        with f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                kept = []
+                for line in f.readlines():
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if not self._is_folded_log_record(record):
+                        kept.append(line)
+                f.seek(0)
+                f.writelines(kept)
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _append_summary_log(self, record: Dict) -> None:
+        """Append one website entry to summary.jsonl; caller must hold the lock."""
+        if self._summary_log is None:
+            self._summary_log = open(self.summary_log_file, 'a', encoding='utf-8', buffering=1)
+
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        # Worker processes of parallel verticals append to the same log
+        if fcntl is not None:
+            fcntl.flock(self._summary_log, fcntl.LOCK_EX)
+        try:
+            self._summary_log.write(line)
+            self._summary_log.flush()
+            os.fsync(self._summary_log.fileno())
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._summary_log, fcntl.LOCK_UN)
 
     def _save_global_summary(self) -> None:
         """Save the global summary to file."""
-        with open(self.global_summary_file, 'w', encoding='utf-8') as f:
-            json.dump(self.global_summary, f, indent=2, ensure_ascii=False)
-        print(f"✅ Global summary updated: {self.global_summary_file}")
+        self._dirty_count = 0
+        if not self.persist_summary:
+            return
+        _write_json(self.global_summary_file, self.global_summary)
+        self._compact_summary_log()
+        tqdm.write(f"✅ Global summary updated: {self.global_summary_file}")
+
+    def flush_global_summary(self) -> None:
+        """Write the global summary if there are unsaved updates."""
+        with self._summary_lock:
+            if self._dirty_count:
+                self._save_global_summary()
+
+    def _handle_sigterm(self, signum, frame) -> None:
+        """Flush pending summary updates before terminating."""
+        self.flush_global_summary()
+        sys.exit(128 + signum)
+
+    def _init_summary_sums(self) -> Dict:
+        """
+        Initialize the running metric sums from the loaded global summary.
+
+        Per-vertical sums are stored on each vertical entry (_sum_p, _sum_r, _sum_f1)
+        and are only recomputed from the website entries when missing (summaries
+        written before they existed) or in force mode.
+
+        Returns:
+            Overall sums across all verticals
+        """
+        overall_sums = {'precision': 0.0, 'recall': 0.0, 'f1': 0.0, 'count': 0, 'total_websites': 0}
+
+        for vertical_data in self.global_summary['verticals'].values():
+            sites = vertical_data['websites'].values()
+            if self.force or '_sum_p' not in vertical_data:
+                vertical_data['_sum_p'] = sum(s['precision'] for s in sites)
+                vertical_data['_sum_r'] = sum(s['recall'] for s in sites)
+                vertical_data['_sum_f1'] = sum(s['f1'] for s in sites)
+
+            overall_sums['precision'] += vertical_data['_sum_p']
+            overall_sums['recall'] += vertical_data['_sum_r']
+            overall_sums['f1'] += vertical_data['_sum_f1']
+            overall_sums['count'] += len(vertical_data['websites'])
+            overall_sums['total_websites'] += vertical_data['total_websites']
+
+        return overall_sums
+
+    def _refresh_overall_metrics(self) -> Dict:
+        """Recompute the overall averages from the running sums; caller must hold the lock."""
+        overall_sums = self._overall_sums
+        overall = self.global_summary['overall']
+        if overall_sums['count']:
+            overall['precision'] = overall_sums['precision'] / overall_sums['count']
+            overall['recall'] = overall_sums['recall'] / overall_sums['count']
+            overall['f1'] = overall_sums['f1'] / overall_sums['count']
+        overall['completed_websites'] = overall_sums['count']
+        overall['total_websites'] = overall_sums['total_websites']
+        return overall
+
+    def merge_vertical_summary(self, vertical: str, vertical_data: Dict) -> None:
+        """
+        Replace the summary entry of a vertical with one computed elsewhere.
+
+        Used to collect the results of verticals evaluated in worker processes.
+
+        Args:
+            vertical: Vertical name
+            vertical_data: Vertical entry of the worker's global summary
+        """
+        with self._summary_lock:
+            self.global_summary['verticals'][vertical] = vertical_data
+            self._overall_sums = self._init_summary_sums()
+            self._refresh_overall_metrics()
+            self.global_summary['timestamp'] = datetime.now().isoformat()
+            self._dirty_count += 1
+            if self._pending is None:
+                self._pbar.update(len(vertical_data['websites']))
+            else:
+                self._pbar.update(sum(
+                    1 for v, website in self._pending if v == vertical and website in vertical_data['websites']
+                ))
 
     def _update_global_summary(self, vertical: str, website: str, results: Dict) -> None:
         """
@@ -162,6 +749,50 @@ class SWDEEvaluationRunner:
             website: Website name
             results: Evaluation results
         """
+        with self._summary_lock:
+            self._update_global_summary_locked(vertical, website, results)
+
+    def _update_global_summary_locked(self, vertical: str, website: str, results: Dict) -> None:
+        """Update the global summary; caller must hold self._summary_lock."""
+        overall_metrics = results['overall_metrics']
+        statistics = results['statistics']
+
+        # Add website results
+        entry = {
+            'timestamp': datetime.now().isoformat(),
+            'precision': overall_metrics['precision'],
+            'recall': overall_metrics['recall'],
+            'f1': overall_metrics['f1'],
+            'evaluated_pages': statistics['evaluated_pages'],
+            'errors': statistics['errors'],
+            'attribute_metrics': results['attribute_metrics']
+        }
+        self._apply_website_entry(vertical, website, entry)
+        overall = self._refresh_overall_metrics()
+        self._append_summary_log({'vertical': vertical, 'website': website, **entry})
+
+        self._pbar.update(1)
+        self._pbar.set_postfix(
+            P=f"{overall['precision']:.2%}",
+            R=f"{overall['recall']:.2%}",
+            F1=f"{overall['f1']:.2%}"
+        )
+
+        # Update timestamp
+        self.global_summary['timestamp'] = entry['timestamp']
+        self._dirty_count += 1
+
+    def _apply_website_entry(self, vertical: str, website: str, entry: Dict) -> None:
+        """
+        Store a website entry and update the running sums; caller must hold the lock.
+
+        Overall averages are not refreshed here, see _refresh_overall_metrics().
+
+        Args:
+            vertical: Vertical name
+            website: Website name
+            entry: Website entry of the global summary
+        """
         # Initialize vertical if not exists
         if vertical not in self.global_summary['verticals']:
             self.global_summary['verticals'][vertical] = {
@@ -172,52 +803,116 @@ class SWDEEvaluationRunner:
                     'f1': 0.0
                 },
                 'completed_websites': 0,
-                'total_websites': len(VERTICALS.get(vertical, []))
+                'total_websites': VERTICAL_SIZES.get(vertical, 0),
+                '_sum_p': 0.0,
+                '_sum_r': 0.0,
+                '_sum_f1': 0.0
             }
+            self._overall_sums['total_websites'] += self.global_summary['verticals'][vertical]['total_websites']
 
-        # Add website results
-        self.global_summary['verticals'][vertical]['websites'][website] = {
-            'timestamp': datetime.now().isoformat(),
-            'precision': results['overall_metrics']['precision'],
-            'recall': results['overall_metrics']['recall'],
-            'f1': results['overall_metrics']['f1'],
-            'evaluated_pages': results['statistics']['evaluated_pages'],
-            'errors': results['statistics']['errors'],
-            'attribute_metrics': results['attribute_metrics']
-        }
+        vertical_data = self.global_summary['verticals'][vertical]
+        websites = vertical_data['websites']
+        old_site = websites.get(website)
+        precision, recall, f1 = entry['precision'], entry['recall'], entry['f1']
+        websites[website] = entry
+
+        # Apply the delta against the previous entry of this website (if any)
+        if old_site:
+            delta_p = precision - old_site['precision']
+            delta_r = recall - old_site['recall']
+            delta_f1 = f1 - old_site['f1']
+        else:
+            delta_p, delta_r, delta_f1 = precision, recall, f1
 
         # Update vertical metrics (average across all completed websites)
-        vertical_data = self.global_summary['verticals'][vertical]
-        completed_sites = list(vertical_data['websites'].values())
-        if completed_sites:
-            vertical_data['metrics']['precision'] = sum(s['precision'] for s in completed_sites) / len(completed_sites)
-            vertical_data['metrics']['recall'] = sum(s['recall'] for s in completed_sites) / len(completed_sites)
-            vertical_data['metrics']['f1'] = sum(s['f1'] for s in completed_sites) / len(completed_sites)
-            vertical_data['completed_websites'] = len(completed_sites)
-
-        # Update overall metrics (weighted average across all websites in all verticals)
-        all_results = []
-        total_websites = 0
-        completed_websites = 0
+        vertical_data['_sum_p'] += delta_p
+        vertical_data['_sum_r'] += delta_r
+        vertical_data['_sum_f1'] += delta_f1
+        completed = len(websites)
+        vertical_data['metrics']['precision'] = vertical_data['_sum_p'] / completed
+        vertical_data['metrics']['recall'] = vertical_data['_sum_r'] / completed
+        vertical_data['metrics']['f1'] = vertical_data['_sum_f1'] / completed
+        vertical_data['completed_websites'] = completed
+
+        # Update overall sums (average across all websites in all verticals)
+        overall_sums = self._overall_sums
+        overall_sums['precision'] += delta_p
+        overall_sums['recall'] += delta_r
+        overall_sums['f1'] += delta_f1
+        if old_site is None:
+            overall_sums['count'] += 1
+
+    @staticmethod
+    def _scan_website_dir(website_dir: Path) -> Dict:
+        """
+        Record which outputs exist for a single website directory.
 
-        for vert_name, vert_data in self.global_summary['verticals'].items():
-            total_websites += vert_data['total_websites']
-            for site_results in vert_data['websites'].values():
-                all_results.append(site_results)
-                completed_websites += 1
+        Args:
+            website_dir: Output directory of the website
 
-        if all_results:
-            self.global_summary['overall']['precision'] = sum(r['precision'] for r in all_results) / len(all_results)
-            self.global_summary['overall']['recall'] = sum(r['recall'] for r in all_results) / len(all_results)
-            self.global_summary['overall']['f1'] = sum(r['f1'] for r in all_results) / len(all_results)
-            self.global_summary['overall']['completed_websites'] = completed_websites
-            self.global_summary['overall']['total_websites'] = total_websites
+        Returns:
+            Dict with the number of agent result files and whether the evaluation report exists
+        """
+        result_files = 0
+        try:
+            with os.scandir(website_dir / "result") as it:
+                result_files = sum(1 for entry in it if entry.name.endswith('.json') and entry.is_file())
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+        return {
+            'result_files': result_files,
+            'has_report': (website_dir / "evaluation" / REPORT_FILE).is_file()
+        }
 
-        # Update timestamp
-        self.global_summary['timestamp'] = datetime.now().isoformat()
+    def _scan_vertical(self, vertical: str) -> None:
+        """Index the outputs of every website of a vertical, unless already done."""
+        with self._fs_index_lock:
+            if vertical in self._scanned_verticals:
+                return
+
+            for website_entry in _list_subdirs(self.output_root / vertical):
+                if website_entry.name.startswith('_'):
+                    continue
+                self._fs_index[(vertical, website_entry.name)] = self._scan_website_dir(Path(website_entry.path))
+                self._mkdir_done.add(website_entry.path)
+            self._scanned_verticals.add(vertical)
+
+    def _scan_completed(self, vertical: str) -> Set[str]:
+        """
+        Get the websites of a vertical whose agent results and evaluation report both exist.
+
+        Args:
+            vertical: Vertical name
+
+        Returns:
+            Set of website names
+        """
+        self._scan_vertical(vertical)
+        with self._fs_index_lock:
+            return {
+                website for (v, website), fs_entry in self._fs_index.items()
+                if v == vertical and fs_entry['result_files'] > 0 and fs_entry['has_report']
+            }
 
-        # Save to file
-        self._save_global_summary()
+    def _ensure_dir(self, path: Path) -> None:
+        """Create a directory (and parents) unless this runner already knows it exists."""
+        key = str(path)
+        if key not in self._mkdir_done:
+            path.mkdir(parents=True, exist_ok=True)
+            self._mkdir_done.add(key)
+
+    def _get_fs_entry(self, vertical: str, website: str) -> Dict:
+        """Get the indexed outputs of a website."""
+        self._scan_vertical(vertical)
+        return self._fs_index.get((vertical, website), {'result_files': 0, 'has_report': False})
+
+    def _refresh_fs_entry(self, vertical: str, website: str) -> None:
+        """Re-scan a website directory after its outputs have changed."""
+        self._scan_vertical(vertical)
+        fs_entry = self._scan_website_dir(self.output_root / vertical / website)
+        with self._fs_index_lock:
+            self._fs_index[(vertical, website)] = fs_entry
 
     def _is_agent_completed(self, vertical: str, website: str) -> bool:
         """
@@ -233,18 +928,12 @@ class SWDEEvaluationRunner:
         if not self.skip_agent:
             return False
 
-        output_dir = self.output_root / vertical / website
-        result_dir = output_dir / "result"
-
-        # Check if result directory exists and has JSON files
-        if not result_dir.exists():
-            return False
-
-        json_files = list(result_dir.glob("*.json"))
-        if not json_files:
+        # Check if result directory has JSON files
+        result_files = self._get_fs_entry(vertical, website)['result_files']
+        if not result_files:
             return False
 
-        print(f"  ✓ Agent output found: {len(json_files)} result files")
+        tqdm.write(f"  ✓ Agent output found: {result_files} result files")
         return True
 
     def _is_evaluation_completed(self, vertical: str, website: str) -> bool:
@@ -261,11 +950,9 @@ class SWDEEvaluationRunner:
         if not self.skip_evaluation:
             return False
 
-        eval_dir = self.output_root / vertical / website / "evaluation"
-        report_file = eval_dir / "evaluation_report.json"
-
-        if report_file.exists():
-            print(f"  ✓ Evaluation report found: {report_file}")
+        if self._get_fs_entry(vertical, website)['has_report']:
+            report_file = self.output_root / vertical / website / "evaluation" / REPORT_FILE
+            tqdm.write(f"  ✓ Evaluation report found: {report_file}")
             return True
 
         return False
@@ -284,43 +971,102 @@ class SWDEEvaluationRunner:
         if not self.resume:
             return False
 
-        # Check global summary
-        if vertical not in self.global_summary['verticals']:
-            return False
+        # Follow the resume plan, which already checked the summary and outputs
+        if self._pending is not None:
+            return (vertical, website) not in self._pending
 
-        if website not in self.global_summary['verticals'][vertical]['websites']:
+        # Check global summary
+        if not self._in_global_summary(vertical, website):
             return False
 
         # Also verify the files actually exist
-        output_dir = self.output_root / vertical / website
-        result_dir = output_dir / "result"
-        eval_dir = output_dir / "evaluation"
-
-        has_results = result_dir.exists() and list(result_dir.glob("*.json"))
-        has_eval = (eval_dir / "evaluation_report.json").exists()
-
-        if has_results and has_eval:
-            print(f"  ✓ Found existing results and evaluation")
+        if self._has_complete_outputs(vertical, website):
+            tqdm.write(f"  ✓ Found existing results and evaluation")
             return True
         else:
-            print(f"  ⚠ Entry in summary but missing files (will re-run)")
+            tqdm.write(f"  ⚠ Entry in summary but missing files (will re-run)")
             return False
 
+    def _in_global_summary(self, vertical: str, website: str) -> bool:
+        """Check whether the global summary has an entry for a website."""
+        with self._summary_lock:
+            vertical_data = self.global_summary['verticals'].get(vertical)
+            return vertical_data is not None and website in vertical_data['websites']
+
+    def _has_complete_outputs(self, vertical: str, website: str) -> bool:
+        """Check whether both agent results and the evaluation report of a website exist."""
+        fs_entry = self._get_fs_entry(vertical, website)
+        return fs_entry['result_files'] > 0 and fs_entry['has_report']
+
+    def plan_resume(self, work_plan: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """
+        Filter a work plan down to the websites that still need to run, and follow that plan.
+
+        Uses the in-memory summary and output index, so no per-website file checks are made.
+        In resume mode the remaining pairs are kept on the runner: later completion checks
+        become set lookups and the progress bar counts only the remaining websites.
+
+        Args:
+            work_plan: (vertical, website) pairs
+
+        Returns:
+            The pairs that are not completed (all of them unless in resume mode)
+        """
+        if not self.resume:
+            return list(work_plan)
+
+        completed = {vertical: self._scan_completed(vertical) for vertical in {v for v, _ in work_plan}}
+        remaining = [
+            (vertical, website) for vertical, website in work_plan
+            if not (website in completed[vertical] and self._in_global_summary(vertical, website))
+        ]
+        self._pending = set(remaining)
+        self._pbar.reset(total=len(remaining))
+        return remaining
+
     def _print_progress(self) -> None:
         """Print current overall progress and metrics."""
         overall = self.global_summary['overall']
-        print(f"\n{'='*80}")
-        print(f"📊 OVERALL PROGRESS")
-        print(f"{'='*80}")
-        print(f"Progress: {overall['completed_websites']}/{overall['total_websites']} websites completed")
+        lines = [
+            f"\n{'='*80}",
+            f"📊 OVERALL PROGRESS",
+            f"{'='*80}",
+            f"Progress: {overall['completed_websites']}/{overall['total_websites']} websites completed",
+        ]
         if overall['completed_websites'] > 0:
-            print(f"Current Overall Metrics:")
-            print(f"  Precision: {overall['precision']:.2%}")
-            print(f"  Recall:    {overall['recall']:.2%}")
-            print(f"  F1 Score:  {overall['f1']:.2%}")
-        print(f"{'='*80}\n")
+            lines += [
+                f"Current Overall Metrics:",
+                f"  Precision: {overall['precision']:.2%}",
+                f"  Recall:    {overall['recall']:.2%}",
+                f"  F1 Score:  {overall['f1']:.2%}",
+            ]
+        lines.append(f"{'='*80}\n")
+        _write_banner(lines)
+
+    def _build_html_dir_index(self) -> Dict[Tuple[str, str], Path]:
+        """
+        Map (vertical, website) to its HTML directory in the dataset.
+
+        Directories inside the vertical subdirectory take precedence over ones in the
+        dataset root, and "<vertical>-<website>(...)" over "<vertical>-<website>".
 
-    def get_html_directory(self, vertical: str, website: str) -> Path:
+        Returns:
+            Dict mapping (vertical, website) to the HTML directory
+        """
+        html_dirs = {}
+        vertical_dirs = [e.path for e in _list_subdirs(self.dataset_dir) if e.name in VERTICALS]
+
+        for search_dir in vertical_dirs + [self.dataset_dir]:
+            entries = sorted(_list_subdirs(search_dir), key=lambda e: '(' not in e.name)
+            for entry in entries:
+                match = HTML_DIR_PATTERN.match(entry.name)
+                if match:
+                    key = (match.group('vertical'), match.group('website'))
+                    html_dirs.setdefault(key, Path(entry.path))
+
+        return html_dirs
+
+    def get_html_directory(self, vertical: str, website: str) -> Optional[Path]:
         """
         Get the HTML directory for a vertical-website combination.
 
@@ -329,30 +1075,9 @@ class SWDEEvaluationRunner:
             website: Website name
 
         Returns:
-            Path to HTML directory
+            Path to HTML directory, or None if the website is not in the dataset
         """
-        # Try different naming patterns
-        patterns = [
-            f"{vertical}-{website}(*)",
-            f"{vertical}-{website}",
-        ]
-
-        # First try in the vertical subdirectory
-        vertical_dir = self.dataset_dir / vertical
-        if vertical_dir.exists():
-            for pattern in patterns:
-                matches = list(vertical_dir.glob(pattern))
-                if matches:
-                    return matches[0]
-
-        # Fallback: try in the root dataset directory
-        for pattern in patterns:
-            matches = list(self.dataset_dir.glob(pattern))
-            if matches:
-                return matches[0]
-
-        # Return None instead of raising exception (website may not exist in dataset)
-        return None
+        return self._html_dirs.get((vertical, website))
 
     def run_agent(self, vertical: str, website: str) -> Path:
         """
@@ -365,24 +1090,22 @@ class SWDEEvaluationRunner:
         Returns:
             Path to agent output directory
         """
-        print(f"\n{'='*80}")
-        print(f"Running agent for: {vertical}/{website}")
         if self.use_predefined_schema:
-            print(f"Mode: Using Predefined Schema from Groundtruth")
+            mode = "Mode: Using Predefined Schema from Groundtruth"
         else:
-            print(f"Mode: Auto Schema Extraction")
-        print(f"{'='*80}")
+            mode = "Mode: Auto Schema Extraction"
+        _write_banner([f"\n{'='*80}", f"Running agent for: {vertical}/{website}", mode, f"{'='*80}"])
 
         # Get HTML directory
         html_dir = self.get_html_directory(vertical, website)
         if html_dir is None:
-            print(f"⊘ Skipping {vertical}/{website}: HTML directory not found in dataset")
+            tqdm.write(f"⊘ Skipping {vertical}/{website}: HTML directory not found in dataset")
             raise FileNotFoundError(f"HTML directory not found for {vertical}/{website}")
-        print(f"HTML directory: {html_dir}")
+        tqdm.write(f"HTML directory: {html_dir}")
 
         # Create output directory
         output_dir = self.output_root / vertical / website
-        output_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(output_dir)
 
         # If using predefined schema, call agent directly via Python API
         if self.use_predefined_schema:
@@ -391,24 +1114,25 @@ class SWDEEvaluationRunner:
             if not schema_path:
                 raise ValueError(f"Schema template not found for {vertical}/{website}")
 
-            print(f"Using schema template: {schema_path}")
+            tqdm.write(f"Using schema template: {schema_path}")
 
-            # Load schema template from file
-            import json
-            with open(schema_path, 'r', encoding='utf-8') as f:
-                schema_template = json.load(f)
+            # Load schema template (cached across runs of the same website)
+            schema_key = str(schema_path)
+            schema_template = self._schema_cache.get(schema_key)
+            if schema_template is None:
+                schema_template = self._schema_cache.setdefault(schema_key, _read_json(schema_path))
 
-            print(f"Loaded schema with fields: {list(schema_template.keys())}")
+            tqdm.write(f"Loaded schema with fields: {list(schema_template.keys())}")
 
             # Import and call agent directly
             from web2json.agent import ParserAgent
 
             # Get HTML files
-            html_files = sorted([str(f) for f in Path(html_dir).glob("*.htm*")])
+            html_files = list(_list_html_files(str(html_dir), os.path.getmtime(html_dir)))
             if not html_files:
                 raise FileNotFoundError(f"No HTML files found in {html_dir}")
 
-            print(f"Found {len(html_files)} HTML files")
+            tqdm.write(f"Found {len(html_files)} HTML files")
 
             # Create agent with predefined schema
             agent = ParserAgent(
@@ -418,8 +1142,8 @@ class SWDEEvaluationRunner:
             )
 
             # Run agent
-            print("Running agent with predefined schema (this may take a while)...")
-            print("-" * 80)
+            tqdm.write("Running agent with predefined schema (this may take a while)...")
+            tqdm.write("-" * 80)
 
             try:
                 result = agent.generate_parser(
@@ -429,13 +1153,13 @@ class SWDEEvaluationRunner:
                     # schema_mode and schema_template already set in agent initialization
                 )
 
-                print("-" * 80)
+                tqdm.write("-" * 80)
                 if not result.get('success'):
                     error_msg = result.get('error', 'Unknown error')
-                    print(f"Error: Agent failed - {error_msg}")
+                    tqdm.write(f"Error: Agent failed - {error_msg}")
                     raise RuntimeError(f"Agent failed: {error_msg}")
 
-                print("✅ Agent completed successfully!")
+                tqdm.write("✅ Agent completed successfully!")
 
                 # Return result directory
                 result_dir = output_dir / "result"
@@ -445,9 +1169,32 @@ class SWDEEvaluationRunner:
                 return result_dir
 
             except Exception as e:
-                print(f"Error running agent: {e}")
+                tqdm.write(f"Error running agent: {e}")
                 raise
 
+        elif self.agent_workers > 0:
+            tqdm.write("Running agent in worker pool (this may take a while)...")
+            tqdm.write("-" * 80)
+
+            # No timeout here: the job runs inside a shared worker process, so giving up
+            # waiting would not stop it (interrupts shut the pool down instead)
+            result = self._get_agent_pool().submit(str(html_dir), str(output_dir), website).result()
+
+            tqdm.write("-" * 80)
+            if not result['success']:
+                error_msg = result.get('error') or 'Unknown error'
+                tqdm.write(f"Error: Agent failed - {error_msg}")
+                raise RuntimeError(f"Agent failed: {error_msg}")
+
+            tqdm.write("✅ Agent completed successfully!")
+
+            # Return result directory
+            result_dir = output_dir / "result"
+            if not result_dir.exists():
+                raise FileNotFoundError(f"Result directory not found: {result_dir}")
+
+            return result_dir
+
         else:
             # Original subprocess-based approach
             cmd = [
@@ -457,24 +1204,23 @@ class SWDEEvaluationRunner:
                 "-o", str(output_dir),
                 "--domain", website
             ]
+            if self.force:
+                # Regenerate the parser even if web2json cached one for identical inputs
+                cmd.append("--no-cache")
 
-            print(f"Command: {' '.join(cmd)}")
-            print("Running agent (this may take a while)...")
-            print("-" * 80)
+            tqdm.write(f"Command: {' '.join(cmd)}")
+            tqdm.write("Running agent (this may take a while)...")
+            tqdm.write("-" * 80)
 
             try:
-                result = subprocess.run(
-                    cmd,
-                    cwd=Path(__file__).parent.parent,
-                    timeout=3600  # 1 hour timeout
-                )
+                returncode = self._run_agent_process(cmd, f"{vertical}/{website}", timeout=3600)  # 1 hour timeout
 
-                print("-" * 80)
-                if result.returncode != 0:
-                    print(f"Error running agent (return code {result.returncode})")
-                    raise RuntimeError(f"Agent failed with return code {result.returncode}")
+                tqdm.write("-" * 80)
+                if returncode != 0:
+                    tqdm.write(f"Error running agent (return code {returncode})")
+                    raise RuntimeError(f"Agent failed with return code {returncode}")
 
-                print("✅ Agent completed successfully!")
+                tqdm.write("✅ Agent completed successfully!")
 
                 # Return result directory
                 result_dir = output_dir / "result"
@@ -484,9 +1230,127 @@ class SWDEEvaluationRunner:
                 return result_dir
 
             except subprocess.TimeoutExpired:
-                print("Agent execution timed out!")
+                tqdm.write("Agent execution timed out!")
                 raise
 
+    def _get_agent_pool(self) -> AgentWorkerPool:
+        """Get the agent worker pool, starting it on first use."""
+        with self._agent_pool_lock:
+            if self._agent_pool is None:
+                tqdm.write(f"Starting {self.agent_workers} agent worker processes...")
+                self._agent_pool = AgentWorkerPool(self.agent_workers)
+                atexit.register(self._agent_pool.shutdown)
+            return self._agent_pool
+
+    @staticmethod
+    def _stream_agent_output(proc: subprocess.Popen, label: str) -> None:
+        """Echo the agent's output line by line, prefixed with the website label."""
+        for line in proc.stdout:
+            tqdm.write(f"[{label}] {line.rstrip()}")
+
+    def _run_agent_process(self, cmd: List[str], label: str, timeout: int) -> int:
+        """
+        Run the agent subprocess, streaming its output while waiting for it.
+
+        Args:
+            cmd: Agent command line
+            label: Prefix for the streamed output lines (vertical/website)
+            timeout: Timeout in seconds
+
+        Returns:
+            Return code of the agent process
+
+        Raises:
+            subprocess.TimeoutExpired: If the agent did not finish within the timeout
+        """
+        # Start the agent in its own process group so it can be terminated
+        # together with any children it spawns
+        if os.name == 'nt':
+            group_kwargs = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            group_kwargs = {'start_new_session': True}
+
+        proc = subprocess.Popen(
+            cmd,
+            cwd=Path(__file__).parent.parent,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            **group_kwargs
+        )
+        with self._agent_procs_lock:
+            self._agent_procs.add(proc)
+            stopping = self._stopping.is_set()
+
+        # Read output on a separate thread so the timeout is enforced while streaming
+        reader = threading.Thread(target=self._stream_agent_output, args=(proc, label), daemon=True)
+        reader.start()
+        try:
+            if stopping:
+                # Started while the run was being interrupted
+                raise RuntimeError("Evaluation run is shutting down")
+            return proc.wait(timeout=timeout)
+        except BaseException:
+            # Timeout, interrupt (the agent runs in its own session, so Ctrl-C
+            # does not reach it) or shutdown: stop the agent before waiting on its output
+            self._terminate_agent_process(proc)
+            raise
+        finally:
+            reader.join()
+            with self._agent_procs_lock:
+                self._agent_procs.discard(proc)
+
+    @staticmethod
+    def _terminate_agent_process(proc: subprocess.Popen, grace_period: float = 5) -> None:
+        """
+        Terminate an agent process and its process group.
+
+        Sends SIGTERM to the group, then SIGKILL if it is still alive after the grace period.
+
+        Args:
+            proc: Agent process started by _run_agent_process
+            grace_period: Seconds to wait between SIGTERM and SIGKILL
+        """
+        if proc.poll() is not None:
+            return
+
+        if os.name == 'nt':
+            proc.terminate()
+            try:
+                proc.wait(timeout=grace_period)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+            return
+
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+            try:
+                proc.wait(timeout=grace_period)
+            except subprocess.TimeoutExpired:
+                os.killpg(proc.pid, signal.SIGKILL)
+                proc.wait()
+        except ProcessLookupError:
+            # Process group already gone
+            pass
+
+    def terminate_agent_processes(self) -> None:
+        """
+        Stop starting new agents and terminate all that are still running.
+
+        Called when a run is interrupted and registered with atexit.
+        """
+        with self._agent_procs_lock:
+            self._stopping.set()
+            procs = list(self._agent_procs)
+        for proc in procs:
+            self._terminate_agent_process(proc)
+        if self._agent_pool is not None:
+            self._agent_pool.shutdown(grace_period=0)
+
     def evaluate_website(self, vertical: str, website: str, agent_output_dir: Path) -> Dict:
         """
         Evaluate agent output for a website.
@@ -499,19 +1363,18 @@ class SWDEEvaluationRunner:
         Returns:
             Evaluation results
         """
-        print(f"\nEvaluating {vertical}/{website}...")
+        tqdm.write(f"\nEvaluating {vertical}/{website}...")
 
-        evaluator = SWDEEvaluator(str(self.groundtruth_dir))
-        results = evaluator.evaluate_website(vertical, website, agent_output_dir)
+        results = self.evaluator.evaluate_website(vertical, website, agent_output_dir)
 
-        print(f"Evaluation completed!")
-        print(f"  Precision: {results['overall_metrics']['precision']:.2%}")
-        print(f"  Recall: {results['overall_metrics']['recall']:.2%}")
-        print(f"  F1 Score: {results['overall_metrics']['f1']:.2%}")
+        tqdm.write(f"Evaluation completed!")
+        tqdm.write(f"  Precision: {results['overall_metrics']['precision']:.2%}")
+        tqdm.write(f"  Recall: {results['overall_metrics']['recall']:.2%}")
+        tqdm.write(f"  F1 Score: {results['overall_metrics']['f1']:.2%}")
 
         return results
 
-    def generate_reports(self, vertical: str, website: str, results: Dict) -> None:
+    def generate_reports(self, vertical: str, website: str, results: Dict) -> Dict:
         """
         Generate evaluation reports.
 
@@ -519,14 +1382,28 @@ class SWDEEvaluationRunner:
             vertical: Vertical name
             website: Website name
             results: Evaluation results
+
+        Returns:
+            The results that were written (also kept in the in-memory report cache)
         """
         report_dir = self.output_root / vertical / website / "evaluation"
-        reporter = EvaluationReporter(report_dir)
+        from evaluation.visualization import EvaluationReporter
+        reporter = EvaluationReporter(report_dir, chart_format=self.chart_format, pretty_json=self.pretty_json)
         reporter.generate_full_report(results)
+        self._cache_report(vertical, website, results)
+        return results
 
-    def run_single_website(self, vertical: str, website: str) -> Dict:
+    def _cache_report(self, vertical: str, website: str, results: Dict) -> None:
+        """Remember the full results of a website, evicting the least recently used entry."""
+        with self._summary_lock:
+            self._report_cache[(vertical, website)] = results
+            self._report_cache.move_to_end((vertical, website))
+            if len(self._report_cache) > self._report_cache_size:
+                self._report_cache.popitem(last=False)
+
+    def _cached_report(self, vertical: str, website: str) -> Dict:
         """
-        Run complete evaluation for a single website.
+        Get the full evaluation results of a website, from memory if possible.
 
         Args:
             vertical: Vertical name
@@ -535,51 +1412,222 @@ class SWDEEvaluationRunner:
         Returns:
             Evaluation results
         """
-        print(f"\n{'='*80}")
-        print(f"Processing: {vertical}/{website}")
-        print(f"{'='*80}")
+        with self._summary_lock:
+            results = self._report_cache.get((vertical, website))
+            if results is not None:
+                self._report_cache.move_to_end((vertical, website))
+                return results
+
+        results = _read_json(self.output_root / vertical / website / "evaluation" / REPORT_FILE)
+        self._cache_report(vertical, website, results)
+        return results
+
+    def load_completed_vertical(self, vertical: str) -> List[Dict]:
+        """
+        Load the full results of a vertical whose websites are all completed.
 
+        Args:
+            vertical: Vertical name
+
+        Returns:
+            Evaluation results in the configured website order
+        """
+        return [self._cached_report(vertical, website) for website in VERTICALS[vertical]]
+
+    def _run_agent_stage(self, vertical: str, website: str) -> Tuple[Optional[Dict], Optional[Path]]:
+        """
+        Run the agent stage for a website (skipped when output already exists).
+
+        Args:
+            vertical: Vertical name
+            website: Website name
+
+        Returns:
+            (existing results, None) if the website is already completed (resume mode),
+            otherwise (None, agent output directory)
+        """
         # Check if already completed (resume mode)
         if self._is_website_completed(vertical, website):
-            print(f"⏭️  Skipping {vertical}/{website} - already completed (resume mode)")
-            # Return existing results from global summary
-            return self.global_summary['verticals'][vertical]['websites'][website]
+            tqdm.write(f"⏭️  Skipping {vertical}/{website} - already completed (resume mode)")
+            # Websites left out of the resume plan are not counted by the progress bar
+            if self._pending is None:
+                self._pbar.update(1)
+            # Return the top-level metrics of the existing report
+            return self._load_report_summary(vertical, website), None
+
+        _write_banner([f"\n{'='*80}", f"Processing: {vertical}/{website}", f"{'='*80}"])
 
         # Check if agent output already exists
         skip_agent = self._is_agent_completed(vertical, website)
 
         # Run agent if needed
         if skip_agent:
-            print(f"⏭️  Skipping agent execution - using existing output")
+            tqdm.write(f"⏭️  Skipping agent execution - using existing output")
             output_dir = self.output_root / vertical / website
             agent_output_dir = output_dir / "result"
         else:
             agent_output_dir = self.run_agent(vertical, website)
+            self._refresh_fs_entry(vertical, website)
 
-        # Check if evaluation already exists
-        skip_evaluation = self._is_evaluation_completed(vertical, website)
+        return None, agent_output_dir
+
+    def _evaluate_stage(self, vertical: str, website: str, agent_output_dir: Path) -> Tuple[Dict, bool]:
+        """
+        Evaluate agent output for a website, reusing an existing report if present.
 
-        # Evaluate if needed
-        if skip_evaluation:
-            print(f"⏭️  Skipping evaluation - using existing report")
+        Args:
+            vertical: Vertical name
+            website: Website name
+            agent_output_dir: Directory containing agent output
+
+        Returns:
+            Tuple of (evaluation results, whether reports still need to be written)
+        """
+        # Check if evaluation already exists
+        if self._is_evaluation_completed(vertical, website):
+            tqdm.write(f"⏭️  Skipping evaluation - using existing report")
             # Load existing evaluation results
-            eval_dir = self.output_root / vertical / website / "evaluation"
-            report_file = eval_dir / "evaluation_report.json"
-            with open(report_file, 'r', encoding='utf-8') as f:
-                results = json.load(f)
-        else:
-            results = self.evaluate_website(vertical, website, agent_output_dir)
-            # Generate reports
-            self.generate_reports(vertical, website, results)
+            return self._cached_report(vertical, website), False
+
+        return self.evaluate_website(vertical, website, agent_output_dir), True
+
+    def _report_stage(self, vertical: str, website: str, results: Dict, needs_report: bool) -> Dict:
+        """
+        Write reports for a website (if needed) and update the global summary.
+
+        Args:
+            vertical: Vertical name
+            website: Website name
+            results: Evaluation results
+            needs_report: Whether reports still need to be written
+
+        Returns:
+            Evaluation results
+        """
+        if needs_report:
+            results = self.generate_reports(vertical, website, results)
+            self._refresh_fs_entry(vertical, website)
 
         # Update global summary (always update to ensure consistency)
+        # and advance the progress bar
         self._update_global_summary(vertical, website, results)
 
-        # Print current overall progress
-        self._print_progress()
-
         return results
 
+    def _run_evaluation_stage(self, vertical: str, website: str, agent_output_dir: Path) -> Dict:
+        """
+        Run the evaluation stage for a website: evaluate, write reports and update the summary.
+
+        Args:
+            vertical: Vertical name
+            website: Website name
+            agent_output_dir: Directory containing agent output
+
+        Returns:
+            Evaluation results
+        """
+        results, needs_report = self._evaluate_stage(vertical, website, agent_output_dir)
+        return self._report_stage(vertical, website, results, needs_report)
+
+    def _run_website_pipelined(self, vertical: str, website: str) -> Future:
+        """
+        Run the agent stage and hand the evaluation stage off to the evaluation workers.
+
+        Args:
+            vertical: Vertical name
+            website: Website name
+
+        Returns:
+            Future resolving to the evaluation results
+        """
+        results, agent_output_dir = self._run_agent_stage(vertical, website)
+        if results is not None:
+            future = Future()
+            future.set_result(results)
+            return future
+
+        return self._eval_executor.submit(self._run_evaluation_stage, vertical, website, agent_output_dir)
+
+    def _load_report_summary(self, vertical: str, website: str) -> Dict:
+        """
+        Load the top-level metrics of an existing evaluation report.
+
+        Reads the slim summary file (no per-page details) and falls back to the
+        full report for evaluations written before it existed.
+
+        Args:
+            vertical: Vertical name
+            website: Website name
+
+        Returns:
+            Evaluation results (page_results/errors only present when read from the full report)
+        """
+        with self._summary_lock:
+            results = self._report_cache.get((vertical, website))
+        if results is not None:
+            return results
+
+        eval_dir = self.output_root / vertical / website / "evaluation"
+        summary_file = eval_dir / REPORT_SUMMARY_FILE
+        if summary_file.exists():
+            return _read_json(summary_file)
+        return _read_json(eval_dir / REPORT_FILE)
+
+    def run_single_website(self, vertical: str, website: str) -> Dict:
+        """
+        Run complete evaluation for a single website.
+
+        Args:
+            vertical: Vertical name
+            website: Website name
+
+        Returns:
+            Evaluation results
+        """
+        results, agent_output_dir = self._run_agent_stage(vertical, website)
+        if results is not None:
+            return results
+
+        return self._run_evaluation_stage(vertical, website, agent_output_dir)
+
+    @staticmethod
+    def _report_website_error(vertical: str, website: str, error: Exception) -> None:
+        """
+        Report a failure while processing a website.
+
+        Args:
+            vertical: Vertical name
+            website: Website name
+            error: The raised exception
+        """
+        if isinstance(error, FileNotFoundError):
+            # Website not in dataset - skip silently
+            tqdm.write(f"⊘ Skipped {vertical}/{website}: {error}")
+            return
+
+        tqdm.write(f"✗ Error processing {vertical}/{website}: {error}")
+        import traceback
+        traceback.print_exception(error)
+
+    @classmethod
+    def _get_website_result(cls, vertical: str, website: str, future: Future) -> Optional[Dict]:
+        """
+        Get the result of a website future, reporting failures.
+
+        Args:
+            vertical: Vertical name
+            website: Website name
+            future: Future of either stage
+
+        Returns:
+            The future's result, or None if it failed
+        """
+        try:
+            return future.result()
+        except Exception as e:
+            cls._report_website_error(vertical, website, e)
+        return None
+
     def run_vertical(self, vertical: str) -> List[Dict]:
         """
         Run evaluation for all websites in a vertical.
@@ -594,28 +1642,163 @@ class SWDEEvaluationRunner:
             raise ValueError(f"Unknown vertical: {vertical}")
 
         websites = VERTICALS[vertical]
-        all_results = []
+        results_by_website = {}
+        eval_future_to_website = {}
+
+        # Websites are independent and I/O-bound (agent subprocess / LLM calls),
+        # so run up to max_parallel agents at once. Each website's evaluation is
+        # handed to the evaluation workers as soon as its agent finishes, so the
+        # next agent starts without waiting for evaluation and reporting.
+        max_workers = min(self.max_parallel, len(websites))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_website = {
+                executor.submit(self._run_website_pipelined, vertical, website): website
+                for website in websites
+            }
 
-        for website in websites:
             try:
-                results = self.run_single_website(vertical, website)
-                all_results.append(results)
-            except FileNotFoundError as e:
-                # Website not in dataset - skip silently
-                print(f"⊘ Skipped {vertical}/{website}: {e}")
-            except Exception as e:
-                print(f"✗ Error processing {vertical}/{website}: {e}")
-                import traceback
-                traceback.print_exc()
+                for future in as_completed(future_to_website):
+                    website = future_to_website[future]
+                    eval_future = self._get_website_result(vertical, website, future)
+                    if eval_future is not None:
+                        eval_future_to_website[eval_future] = website
+            except BaseException:
+                # Leaving the block joins the workers, which wait on their agents:
+                # drop queued websites and stop the running agents first
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.terminate_agent_processes()
+                raise
+
+        for future in as_completed(eval_future_to_website):
+            website = eval_future_to_website[future]
+            results = self._get_website_result(vertical, website, future)
+            if results is not None:
+                results_by_website[website] = results
+
+        # Keep the configured website order regardless of completion order
+        all_results = [results_by_website[w] for w in websites if w in results_by_website]
+
+        return self._finalize_vertical(vertical, all_results)
+
+    def run_vertical_pipelined(self, vertical: str) -> List[Dict]:
+        """
+        Run evaluation for all websites in a vertical as a three-stage pipeline.
+
+        One thread runs the agents, one evaluates agent output against the
+        groundtruth and one writes reports and updates the global summary. The
+        stages are connected by bounded queues, so a slow evaluation stage
+        back-pressures the agent stage instead of piling up finished outputs.
+
+        Args:
+            vertical: Vertical name
+
+        Returns:
+            List of evaluation results
+        """
+        if vertical not in VERTICALS:
+            raise ValueError(f"Unknown vertical: {vertical}")
+
+        websites = VERTICALS[vertical]
+        results_by_website = {}
+        agent_done = queue.Queue(maxsize=4)
+        eval_done = queue.Queue(maxsize=4)
+
+        def agent_worker():
+            try:
+                for website in websites:
+                    if self._stopping.is_set():
+                        break
+                    try:
+                        results, agent_output_dir = self._run_agent_stage(vertical, website)
+                    except Exception as e:
+                        self._report_website_error(vertical, website, e)
+                        continue
+                    agent_done.put((website, results, agent_output_dir))
+            finally:
+                agent_done.put(None)
+
+        def evaluation_worker():
+            try:
+                while True:
+                    item = agent_done.get()
+                    if item is None:
+                        break
+                    website, results, agent_output_dir = item
+                    if results is not None:
+                        # Already completed in resume mode
+                        results_by_website[website] = results
+                        continue
+                    try:
+                        results, needs_report = self._evaluate_stage(vertical, website, agent_output_dir)
+                    except Exception as e:
+                        self._report_website_error(vertical, website, e)
+                        continue
+                    eval_done.put((website, results, needs_report))
+            finally:
+                eval_done.put(None)
+
+        def report_worker():
+            while True:
+                item = eval_done.get()
+                if item is None:
+                    break
+                website, results, needs_report = item
+                try:
+                    results_by_website[website] = self._report_stage(vertical, website, results, needs_report)
+                except Exception as e:
+                    self._report_website_error(vertical, website, e)
+
+        threads = [
+            threading.Thread(target=agent_worker, name=f"{vertical}-agent"),
+            threading.Thread(target=evaluation_worker, name=f"{vertical}-evaluate"),
+            threading.Thread(target=report_worker, name=f"{vertical}-report"),
+        ]
+        for thread in threads:
+            thread.start()
+        # All websites must be through the pipeline before the vertical reports
+        try:
+            for thread in threads:
+                thread.join()
+        except BaseException:
+            # The stage threads are joined again at interpreter exit: stop the agents first
+            self.terminate_agent_processes()
+            raise
+
+        # Keep the configured website order regardless of completion order
+        all_results = [results_by_website[w] for w in websites if w in results_by_website]
+
+        return self._finalize_vertical(vertical, all_results)
+
+    def _finalize_vertical(self, vertical: str, all_results: List[Dict]) -> List[Dict]:
+        """
+        Checkpoint the global summary and write the vertical summary and integrated report.
+
+        Args:
+            vertical: Vertical name
+            all_results: Evaluation results of the vertical's websites
+
+        Returns:
+            Full evaluation results of the websites (resumed websites are loaded from results.json)
+        """
+        # Checkpoint the global summary and groundtruth cache at the vertical boundary
+        self.flush_global_summary()
+        self._save_groundtruth_cache()
 
         # Generate summary report
         self.generate_vertical_summary(vertical, all_results)
 
+        # Websites skipped in resume mode only carry the slim summary; the integrated
+        # reports need their per-page details, so load the full results for those
+        all_results = [
+            results if 'page_results' in results else self._cached_report(vertical, results['website'])
+            for results in all_results
+        ]
+
         # Generate integrated error report for this vertical
         if all_results:
             integrated_report_path = self.output_root / vertical / "_summary" / "integrated_error_report.html"
-            print(f"\nGenerating integrated error report for {vertical}...")
-            EvaluationReporter.generate_integrated_report(all_results, integrated_report_path)
+            tqdm.write(f"\nGenerating integrated error report for {vertical}...")
+            _generate_integrated_report(all_results, integrated_report_path)
 
         return all_results
 
@@ -628,7 +1811,7 @@ class SWDEEvaluationRunner:
             results_list: List of evaluation results
         """
         summary_dir = self.output_root / vertical / "_summary"
-        summary_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(summary_dir)
 
         # Aggregate statistics
         summary = {
@@ -650,30 +1833,49 @@ class SWDEEvaluationRunner:
 
         # Calculate average metrics
         if results_list:
-            avg_precision = sum(r['overall_metrics']['precision'] for r in results_list) / len(results_list)
-            avg_recall = sum(r['overall_metrics']['recall'] for r in results_list) / len(results_list)
-            avg_f1 = sum(r['overall_metrics']['f1'] for r in results_list) / len(results_list)
-
+            n = len(results_list)
             summary['average_metrics'] = {
-                'precision': avg_precision,
-                'recall': avg_recall,
-                'f1': avg_f1
+                key: sum(r['overall_metrics'][key] for r in results_list) / n
+                for key in METRIC_KEYS
             }
 
         # Save summary
         summary_file = summary_dir / "summary.json"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2)
+        _write_json(summary_file, summary)
 
-        print(f"\nVertical summary saved to: {summary_file}")
+        tqdm.write(f"\nVertical summary saved to: {summary_file}")
 
         if 'average_metrics' in summary:
-            print(f"\nAverage metrics for {vertical}:")
-            print(f"  Precision: {summary['average_metrics']['precision']:.2%}")
-            print(f"  Recall: {summary['average_metrics']['recall']:.2%}")
-            print(f"  F1 Score: {summary['average_metrics']['f1']:.2%}")
+            tqdm.write(f"\nAverage metrics for {vertical}:")
+            tqdm.write(f"  Precision: {summary['average_metrics']['precision']:.2%}")
+            tqdm.write(f"  Recall: {summary['average_metrics']['recall']:.2%}")
+            tqdm.write(f"  F1 Score: {summary['average_metrics']['f1']:.2%}")
         else:
-            print(f"\nNo successful evaluations for {vertical} - cannot compute average metrics")
+            tqdm.write(f"\nNo successful evaluations for {vertical} - cannot compute average metrics")
+
+    def _iter_result_files(self, vertical: str = None, website: str = None):
+        """
+        Yield the evaluation result files of indexed websites.
+
+        Args:
+            vertical: Optional vertical name to filter (if None, all verticals)
+            website: Optional website name to filter (requires vertical)
+
+        Yields:
+            Paths of existing results files
+        """
+        for scan_vertical in ([vertical] if vertical else VERTICALS):
+            self._scan_vertical(scan_vertical)
+
+        with self._fs_index_lock:
+            fs_items = sorted(self._fs_index.items())
+        for (vert, site), fs_entry in fs_items:
+            if vertical and vert != vertical:
+                continue
+            if vertical and website and site != website:
+                continue
+            if fs_entry['has_report']:
+                yield self.output_root / vert / site / "evaluation" / REPORT_FILE
 
     def load_existing_results(self, vertical: str = None, website: str = None) -> List[Dict]:
         """
@@ -686,39 +1888,36 @@ class SWDEEvaluationRunner:
         Returns:
             List of evaluation results
         """
-        results_list = []
-
-        if website and vertical:
-            # Load single website result
-            eval_file = self.output_root / vertical / website / "evaluation" / "results.json"
-            if eval_file.exists():
-                with open(eval_file, 'r', encoding='utf-8') as f:
-                    results = json.load(f)
-                    results_list.append(results)
-        elif vertical:
-            # Load all websites in vertical
-            vertical_dir = self.output_root / vertical
-            if vertical_dir.exists():
-                for website_dir in vertical_dir.iterdir():
-                    if website_dir.is_dir() and not website_dir.name.startswith('_'):
-                        eval_file = website_dir / "evaluation" / "results.json"
-                        if eval_file.exists():
-                            with open(eval_file, 'r', encoding='utf-8') as f:
-                                results = json.load(f)
-                                results_list.append(results)
-        else:
-            # Load all results
-            for vert_dir in self.output_root.iterdir():
-                if vert_dir.is_dir() and vert_dir.name in VERTICALS:
-                    for website_dir in vert_dir.iterdir():
-                        if website_dir.is_dir() and not website_dir.name.startswith('_'):
-                            eval_file = website_dir / "evaluation" / "results.json"
-                            if eval_file.exists():
-                                with open(eval_file, 'r', encoding='utf-8') as f:
-                                    results = json.load(f)
-                                    results_list.append(results)
+        paths = list(self._iter_result_files(vertical, website))
+        if not paths:
+            return []
+
+        # Parsing is dominated by file reads, so load the files concurrently
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+            return list(executor.map(_read_json, paths))
+
 
-        return results_list
+def _run_one_vertical(vertical: str, runner_kwargs: Dict, pipeline: bool = False) -> Tuple[List[Dict], Optional[Dict]]:
+    """
+    Evaluate one vertical in a worker process.
+
+    Builds its own runner from plain kwargs so the parent's runner never has to be pickled.
+
+    Args:
+        vertical: Vertical name
+        runner_kwargs: Keyword arguments for SWDEEvaluationRunner
+        pipeline: Run the vertical as a three-stage pipeline
+
+    Returns:
+        (evaluation results of the vertical, the vertical's global summary entry)
+    """
+    runner = SWDEEvaluationRunner(
+        total_sites=VERTICAL_SIZES[vertical], persist_summary=False, show_progress=False, **runner_kwargs
+    )
+    runner.plan_resume([(vertical, website) for website in VERTICALS[vertical]])
+    run_vertical = runner.run_vertical_pipelined if pipeline else runner.run_vertical
+    vertical_results = run_vertical(vertical)
+    return vertical_results, runner.global_summary['verticals'].get(vertical)
 
 
 def main():
@@ -726,56 +1925,108 @@ def main():
         description='Run SWDE evaluation for web2json-agent',
         epilog='All options can be configured in .env file. Command line arguments override .env settings.'
     )
-    parser.add_argument('--dataset-dir', type=str, default=settings.swde_dataset_dir,
-                       help=f'Root directory of SWDE dataset (default: {settings.swde_dataset_dir})')
-    parser.add_argument('--groundtruth-dir', type=str, default=settings.swde_groundtruth_dir,
-                       help=f'Directory containing groundtruth files (default: {settings.swde_groundtruth_dir})')
-    parser.add_argument('--output-dir', type=str, default=settings.swde_output_dir,
-                       help=f'Root directory for outputs (default: {settings.swde_output_dir})')
+    parser.add_argument('--dataset-dir', type=str, default=None,
+                       help='Root directory of SWDE dataset (default: SWDE_DATASET_DIR from .env)')
+    parser.add_argument('--groundtruth-dir', type=str, default=None,
+                       help='Directory containing groundtruth files (default: SWDE_GROUNDTRUTH_DIR from .env)')
+    parser.add_argument('--output-dir', type=str, default=None,
+                       help='Root directory for outputs (default: SWDE_OUTPUT_DIR from .env)')
     parser.add_argument('--vertical', type=str, choices=list(VERTICALS.keys()),
                        help='Vertical to evaluate (if not specified, evaluate all)')
     parser.add_argument('--website', type=str,
                        help='Specific website to evaluate (requires --vertical)')
-    parser.add_argument('--python', type=str, default=settings.swde_python_cmd,
-                       help=f'Python command to use (default: {settings.swde_python_cmd})')
-    parser.add_argument('--resume', action='store_true', default=settings.swde_resume,
-                       help=f'Resume from previous run (default: {settings.swde_resume})')
-    parser.add_argument('--skip-agent', action='store_true', default=settings.swde_skip_agent,
-                       help=f'Skip agent execution if output already exists (default: {settings.swde_skip_agent})')
-    parser.add_argument('--skip-evaluation', action='store_true', default=settings.swde_skip_evaluation,
-                       help=f'Skip evaluation if report already exists (default: {settings.swde_skip_evaluation})')
-    parser.add_argument('--force', action='store_true', default=settings.swde_force,
-                       help=f'Force re-run everything (default: {settings.swde_force})')
-    parser.add_argument('--use-predefined-schema', action='store_true', default=settings.swde_use_predefined_schema,
-                       help=f'Use predefined schema templates generated from groundtruth (default: {settings.swde_use_predefined_schema})')
+    parser.add_argument('--python', type=str, default=None,
+                       help='Python command to use (default: SWDE_PYTHON_CMD from .env)')
+    parser.add_argument('--resume', action='store_true', default=None,
+                       help='Resume from previous run (default: SWDE_RESUME from .env)')
+    parser.add_argument('--skip-agent', action='store_true', default=None,
+                       help='Skip agent execution if output already exists (default: SWDE_SKIP_AGENT from .env)')
+    parser.add_argument('--skip-evaluation', action='store_true', default=None,
+                       help='Skip evaluation if report already exists (default: SWDE_SKIP_EVALUATION from .env)')
+    parser.add_argument('--force', action='store_true', default=None,
+                       help='Force re-run everything (default: SWDE_FORCE from .env)')
+    parser.add_argument('--use-predefined-schema', action='store_true', default=None,
+                       help='Use predefined schema templates generated from groundtruth (default: SWDE_USE_PREDEFINED_SCHEMA from .env)')
+    parser.add_argument('--jobs', type=int, default=1,
+                       help='Number of verticals to evaluate in parallel worker processes when running all verticals (default: 1)')
+    parser.add_argument('--max-parallel', type=int, default=None,
+                       help='Maximum number of websites to process concurrently within a vertical (default: SWDE_MAX_PARALLEL from .env)')
+    parser.add_argument('--agent-workers', type=int, default=0,
+                       help='Run agents in this many persistent worker processes instead of one subprocess per website (default: 0, subprocesses; ignored with --use-predefined-schema)')
+    parser.add_argument('--parallel-pages', action=argparse.BooleanOptionalAction, default=True,
+                       help='Load and evaluate the pages of a website on a thread pool (default: on)')
+    parser.add_argument('--chart-format', choices=['png', 'webp', 'svg'], default='png',
+                       help='Image format of the per-website evaluation charts; svg skips rasterization and is fastest (default: png)')
+    parser.add_argument('--pretty-json', action=argparse.BooleanOptionalAction, default=True,
+                       help='Write each website\'s results.json indented for reading; --no-pretty-json writes compact JSON, about half the size (default: on)')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='Overlap agent runs, evaluation and report writing of a vertical in a three-stage pipeline')
 
     args = parser.parse_args()
 
+    # Options not given on the command line fall back to the .env settings.
+    # Imported only now so that --help does not load the settings.
+    from web2json.config.settings import settings
+    settings_defaults = {
+        'dataset_dir': settings.swde_dataset_dir,
+        'groundtruth_dir': settings.swde_groundtruth_dir,
+        'output_dir': settings.swde_output_dir,
+        'python': settings.swde_python_cmd,
+        'resume': settings.swde_resume,
+        'skip_agent': settings.swde_skip_agent,
+        'skip_evaluation': settings.swde_skip_evaluation,
+        'force': settings.swde_force,
+        'use_predefined_schema': settings.swde_use_predefined_schema,
+        'max_parallel': settings.swde_max_parallel,
+    }
+    for option, default in settings_defaults.items():
+        if getattr(args, option) is None:
+            setattr(args, option, default)
+
     # Print configuration
-    print(f"\n{'='*80}")
-    print(f"SWDE Evaluation Configuration")
-    print(f"{'='*80}")
-    print(f"Dataset directory:       {args.dataset_dir}")
-    print(f"Groundtruth directory:   {args.groundtruth_dir}")
-    print(f"Output directory:        {args.output_dir}")
-    print(f"Python command:          {args.python}")
-    print(f"Use predefined schema:   {args.use_predefined_schema}")
-    print(f"Resume mode:             {args.resume}")
-    print(f"Skip agent:              {args.skip_agent}")
-    print(f"Skip evaluation:         {args.skip_evaluation}")
-    print(f"Force mode:              {args.force}")
+    lines = [
+        f"\n{'='*80}",
+        f"SWDE Evaluation Configuration",
+        f"{'='*80}",
+        f"Dataset directory:       {args.dataset_dir}",
+        f"Groundtruth directory:   {args.groundtruth_dir}",
+        f"Output directory:        {args.output_dir}",
+        f"Python command:          {args.python}",
+        f"Use predefined schema:   {args.use_predefined_schema}",
+        f"Resume mode:             {args.resume}",
+        f"Skip agent:              {args.skip_agent}",
+        f"Skip evaluation:         {args.skip_evaluation}",
+        f"Force mode:              {args.force}",
+        f"Max parallel websites:   {args.max_parallel}",
+        f"Parallel verticals:      {args.jobs}",
+        f"Pipeline mode:           {args.pipeline}",
+        f"Agent workers:           {args.agent_workers}",
+        f"Parallel pages:          {args.parallel_pages}",
+        f"Chart format:            {args.chart_format}",
+        f"Pretty results JSON:     {args.pretty_json}",
+    ]
     if args.vertical:
-        print(f"Target vertical:         {args.vertical}")
+        lines.append(f"Target vertical:         {args.vertical}")
     if args.website:
-        print(f"Target website:          {args.website}")
-    print(f"{'='*80}\n")
+        lines.append(f"Target website:          {args.website}")
+    lines.append(f"{'='*80}\n")
+    _write_banner(lines)
 
     # Validate arguments
     if args.website and not args.vertical:
         parser.error("--website requires --vertical")
 
+    # Websites covered by this run
+    if args.website:
+        work_plan = [(args.vertical, args.website)]
+    elif args.vertical:
+        work_plan = [(args.vertical, website) for website in VERTICALS[args.vertical]]
+    else:
+        work_plan = WORK_PLAN
+    total_sites = len(work_plan)
+
     # Create runner
-    runner = SWDEEvaluationRunner(
+    runner_kwargs = dict(
         dataset_dir=args.dataset_dir,
         groundtruth_dir=args.groundtruth_dir,
         output_root=args.output_dir,
@@ -784,61 +2035,108 @@ def main():
         skip_agent=args.skip_agent,
         skip_evaluation=args.skip_evaluation,
         force=args.force,
-        use_predefined_schema=args.use_predefined_schema
+        use_predefined_schema=args.use_predefined_schema,
+        max_parallel=args.max_parallel,
+        agent_workers=args.agent_workers,
+        parallel_pages=args.parallel_pages,
+        chart_format=args.chart_format,
+        pretty_json=args.pretty_json
     )
+    runner = SWDEEvaluationRunner(total_sites=total_sites, **runner_kwargs)
+    remaining = runner.plan_resume(work_plan)
+    if runner.resume:
+        tqdm.write(f"Resume plan: {len(remaining)}/{total_sites} websites remaining")
+    # Verticals with nothing left to run are not dispatched; their results are loaded from disk
+    pending_verticals = {vertical for vertical, _ in remaining}
+    run_vertical = runner.run_vertical_pipelined if args.pipeline else runner.run_vertical
 
     # Run evaluation
     if args.website:
         # Single website
         results = runner.run_single_website(args.vertical, args.website)
+        runner.flush_global_summary()
         # Generate single-website integrated report (just shows that one website)
         integrated_report_path = runner.output_root / args.vertical / args.website / "evaluation" / "report.html"
-        print(f"\n{'='*80}")
-        print(f"Report saved to: {integrated_report_path}")
-        print(f"{'='*80}")
+        _write_banner([f"\n{'='*80}", f"Report saved to: {integrated_report_path}", f"{'='*80}"])
     elif args.vertical:
         # All websites in vertical
-        runner.run_vertical(args.vertical)
+        run_vertical(args.vertical)
     else:
         # All verticals
-        print(f"\n{'#'*80}")
-        print(f"# RUNNING FULL SWDE EVALUATION")
-        print(f"# Total verticals: {len(VERTICALS)}")
-        print(f"# Total websites: {sum(len(sites) for sites in VERTICALS.values())}")
-        print(f"# Resume mode: {'ON' if args.resume else 'OFF'}")
-        print(f"# Skip agent: {'ON' if args.skip_agent else 'OFF'}")
-        print(f"# Skip evaluation: {'ON' if args.skip_evaluation else 'OFF'}")
-        print(f"# Force mode: {'ON' if args.force else 'OFF'}")
-        print(f"# Predefined schema: {'ON' if args.use_predefined_schema else 'OFF'}")
-        print(f"{'#'*80}\n")
+        _write_banner([
+            f"\n{'#'*80}",
+            f"# RUNNING FULL SWDE EVALUATION",
+            f"# Total verticals: {len(VERTICALS)}",
+            f"# Total websites: {TOTAL_SITES}",
+            f"# Resume mode: {'ON' if args.resume else 'OFF'}",
+            f"# Skip agent: {'ON' if args.skip_agent else 'OFF'}",
+            f"# Skip evaluation: {'ON' if args.skip_evaluation else 'OFF'}",
+            f"# Force mode: {'ON' if args.force else 'OFF'}",
+            f"# Predefined schema: {'ON' if args.use_predefined_schema else 'OFF'}",
+            f"{'#'*80}\n",
+        ])
 
         all_results = []
-        for vertical in VERTICALS.keys():
-            print(f"\n{'#'*80}")
-            print(f"# Processing vertical: {vertical}")
-            print(f"{'#'*80}")
-            try:
-                vertical_results = runner.run_vertical(vertical)
-                all_results.extend(vertical_results)
-            except Exception as e:
-                print(f"Error processing vertical {vertical}: {e}")
-                import traceback
-                traceback.print_exc()
+        if args.jobs > 1:
+            # Verticals are independent: evaluate them in worker processes, each with
+            # its own runner, and merge their summary entries into the parent's summary
+            results_by_vertical = {
+                vertical: runner.load_completed_vertical(vertical)
+                for vertical in VERTICALS if vertical not in pending_verticals
+            }
+            # spawn: the parent already runs tqdm and executor threads that must not be forked
+            with ProcessPoolExecutor(
+                max_workers=min(args.jobs, len(VERTICALS)),
+                mp_context=multiprocessing.get_context('spawn')
+            ) as executor:
+                future_to_vertical = {
+                    executor.submit(_run_one_vertical, vertical, runner_kwargs, args.pipeline): vertical
+                    for vertical in VERTICALS if vertical in pending_verticals
+                }
+
+                for future in as_completed(future_to_vertical):
+                    vertical = future_to_vertical[future]
+                    try:
+                        vertical_results, vertical_summary = future.result()
+                    except Exception as e:
+                        _log_vertical_error(runner.output_root, vertical, e)
+                        continue
+
+                    tqdm.write(f"[{vertical}] Completed: {len(vertical_results)} websites")
+                    results_by_vertical[vertical] = vertical_results
+                    if vertical_summary is not None:
+                        runner.merge_vertical_summary(vertical, vertical_summary)
+
+            runner.flush_global_summary()
+            for vertical in VERTICALS:
+                all_results.extend(results_by_vertical.get(vertical, []))
+        else:
+            for vertical in VERTICALS:
+                if vertical not in pending_verticals:
+                    tqdm.write(f"⏭️  Skipping vertical {vertical} - all websites completed (resume mode)")
+                    all_results.extend(runner.load_completed_vertical(vertical))
+                    continue
+                _write_banner([f"\n{'#'*80}", f"# Processing vertical: {vertical}", f"{'#'*80}"])
+                try:
+                    vertical_results = run_vertical(vertical)
+                    all_results.extend(vertical_results)
+                except Exception as e:
+                    _log_vertical_error(runner.output_root, vertical, e)
 
         # Generate integrated error report for all results
         if all_results:
             integrated_report_path = runner.output_root / "integrated_error_report.html"
-            print(f"\n{'='*80}")
-            print(f"Generating complete integrated error report for all verticals...")
-            print(f"{'='*80}")
-            EvaluationReporter.generate_integrated_report(all_results, integrated_report_path)
+            _write_banner([
+                f"\n{'='*80}",
+                f"Generating complete integrated error report for all verticals...",
+                f"{'='*80}",
+            ])
+            _generate_integrated_report(all_results, integrated_report_path)
 
         # Print final summary
-        print(f"\n{'#'*80}")
-        print(f"# EVALUATION COMPLETE!")
-        print(f"{'#'*80}")
+        _write_banner([f"\n{'#'*80}", f"# EVALUATION COMPLETE!", f"{'#'*80}"])
         runner._print_progress()
-        print(f"\nGlobal summary saved to: {runner.global_summary_file}")
+        tqdm.write(f"\nGlobal summary saved to: {runner.global_summary_file}")
 
 
 
@@ -3,9 +3,20 @@
 进度条功能演示脚本
 使用少量数据快速演示聚类进度条效果
 """
+import heapq
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from web2json.tools import cluster_html_layouts
 
+
+def _read_html_files(html_files):
+    """用线程池并发读取HTML文件，返回顺序与输入一致"""
+    if not html_files:
+        return []
+    with ThreadPoolExecutor(max_workers=min(32, len(html_files))) as executor:
+        return list(executor.map(lambda f: f.read_text(encoding='utf-8'), html_files))
+
+
 def demo_small_scale():
     """演示：使用50个样本的小规模测试"""
     print("\n" + "="*60)
@@ -18,13 +29,10 @@ def demo_small_scale():
         print(f"错误: 数据目录不存在 {data_dir}")
         return
 
-    html_files = sorted(data_dir.glob("*.htm"))[:50]
-    html_list = []
+    html_files = heapq.nsmallest(50, data_dir.glob("*.htm"))  # 只排序需要的前50个
 
     print(f"\n正在读取 {len(html_files)} 个HTML文件...")
-    for f in html_files:
-        with open(f, 'r', encoding='utf-8') as file:
-            html_list.append(file.read())
+    html_list = _read_html_files(html_files)
 
     # 执行聚类（带进度条）
     import time
@@ -44,7 +52,7 @@ def demo_small_scale():
     print("聚类结果")
     print("="*60)
     n_clusters = len(set(labels) - {-1})
-    n_noise = list(labels).count(-1)
+    n_noise = int((labels == -1).sum())
 
     print(f"总样本数: {len(html_list)}")
     print(f"聚类数量: {n_clusters}")
@@ -66,13 +74,10 @@ def demo_medium_scale():
         print(f"错误: 数据目录不存在 {data_dir}")
         return
 
-    html_files = sorted(data_dir.glob("*.htm"))[:200]
-    html_list = []
+    html_files = heapq.nsmallest(200, data_dir.glob("*.htm"))  # 只排序需要的前200个
 
     print(f"\n正在读取 {len(html_files)} 个HTML文件...")
-    for f in html_files:
-        with open(f, 'r', encoding='utf-8') as file:
-            html_list.append(file.read())
+    html_list = _read_html_files(html_files)
 
     # 执行聚类（带进度条）
     import time
@@ -92,7 +97,7 @@ def demo_medium_scale():
     print("聚类结果")
     print("="*60)
     n_clusters = len(set(labels) - {-1})
-    n_noise = list(labels).count(-1)
+    n_noise = int((labels == -1).sum())
 
     print(f"总样本数: {len(html_list)}")
     print(f"聚类数量: {n_clusters}")
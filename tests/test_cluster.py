@@ -6,9 +6,10 @@ import time
 from pathlib import Path
 from typing import List
 
+import numpy as np
 import pytest
 
-from web2json.tools import cluster_html_layouts, get_feature
+from web2json.tools import cluster_html_layouts, get_feature, similarity
 
 
 class TestCluster:
@@ -31,19 +32,24 @@ class TestCluster:
         Returns:
             HTML源码字符串列表
         """
+        import heapq
+        from concurrent.futures import ThreadPoolExecutor
         from tqdm import tqdm
 
-        html_files = sorted(directory.glob("*.htm"))
         if limit is not None:
-            html_files = html_files[:limit]
-
-        html_list = []
-
-        iterator = tqdm(html_files, desc="读取HTML文件", unit="文件") if show_progress else html_files
-        for html_file in iterator:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                html_list.append(f.read())
-        return html_list
+            # 只取排序后的前 limit 个文件，无需对整个目录排序
+            html_files = heapq.nsmallest(limit, directory.glob("*.htm"))
+        else:
+            html_files = sorted(directory.glob("*.htm"))
+        if not html_files:
+            return []
+
+        # 文件读取以IO等待为主，用线程池并发读取；executor.map 保持输入顺序
+        with ThreadPoolExecutor(max_workers=min(32, len(html_files))) as executor:
+            results = executor.map(lambda f: f.read_text(encoding='utf-8'), html_files)
+            if show_progress:
+                results = tqdm(results, total=len(html_files), desc="读取HTML文件", unit="文件")
+            return list(results)
 
     def _print_cluster_results(self, labels, sim_mat, html_list, elapsed_time):
         """打印聚类结果统计信息
@@ -56,10 +62,12 @@ class TestCluster:
         """
         import numpy as np
 
-        # 统计聚类结果
-        unique_labels = set(labels)
-        n_clusters = len(unique_labels) - (1 if -1 in unique_labels else 0)
-        n_noise = list(labels).count(-1)
+        # 统计聚类结果（一次性按标签分组，避免对每个标签重复遍历）
+        labels_arr = np.asarray(labels)
+        unique_labels = np.unique(labels_arr)
+        cluster_members = {int(label): np.flatnonzero(labels_arr == label) for label in unique_labels}
+        n_clusters = sum(1 for label in cluster_members if label != -1)
+        n_noise = len(cluster_members.get(-1, ()))
 
         print("\n" + "="*60)
         print("聚类结果统计")
@@ -73,36 +81,31 @@ class TestCluster:
         # 打印每个聚类的详细信息
         print("\n聚类详情:")
         print("-"*60)
-        for label in sorted(unique_labels):
+        for label, indices in cluster_members.items():
             if label == -1:
                 cluster_name = "噪声点"
             else:
                 cluster_name = f"聚类 {label}"
 
-            count = list(labels).count(label)
-            indices = [i for i, l in enumerate(labels) if l == label]
-            print(f"{cluster_name}: {count} 个样本")
-            print(f"  样本索引: {indices[:10]}" + ("..." if len(indices) > 10 else ""))
+            print(f"{cluster_name}: {len(indices)} 个样本")
+            print(f"  样本索引: {indices[:10].tolist()}" + ("..." if len(indices) > 10 else ""))
 
         # 计算聚类内和聚类间的相似度统计
         if n_clusters > 0:
             print("\n相似度统计:")
             print("-"*60)
-            for label in sorted(unique_labels):
+            for label, indices in cluster_members.items():
                 if label == -1:
                     continue
 
-                indices = [i for i, l in enumerate(labels) if l == label]
                 if len(indices) > 1:
-                    # 聚类内相似度
-                    intra_sim = []
-                    for i in range(len(indices)):
-                        for j in range(i+1, len(indices)):
-                            intra_sim.append(sim_mat[indices[i], indices[j]])
+                    # 聚类内相似度：取子矩阵的上三角（不含对角线）
+                    sub = sim_mat[np.ix_(indices, indices)]
+                    intra_sim = sub[np.triu_indices_from(sub, k=1)]
 
                     print(f"聚类 {label}:")
-                    print(f"  聚类内平均相似度: {np.mean(intra_sim):.4f}")
-                    print(f"  聚类内相似度范围: [{np.min(intra_sim):.4f}, {np.max(intra_sim):.4f}]")
+                    print(f"  聚类内平均相似度: {intra_sim.mean():.4f}")
+                    print(f"  聚类内相似度范围: [{intra_sim.min():.4f}, {intra_sim.max():.4f}]")
 
         print("="*60 + "\n")
 
@@ -163,7 +166,7 @@ class TestCluster:
         assert n_clusters <= 3, f"同一网站的页面应该聚类为1-3个簇，实际: {n_clusters}"
 
         # 断言：噪声点应该很少
-        n_noise = list(labels).count(-1)
+        n_noise = int((labels == -1).sum())
         noise_ratio = n_noise / len(html_list)
         print(f"断言检查: 噪声点比例 = {noise_ratio:.2%}, 预期 < 5%")
         assert noise_ratio < 0.05, f"噪声点比例过高: {noise_ratio:.2%}"
@@ -236,23 +239,33 @@ class TestCluster:
         print("\n聚类准确性分析:")
         print("-"*60)
 
-        # 统计每个聚类中两个来源的分布
-        unique_labels = sorted(set(labels) - {-1})
-        for label in unique_labels:
-            indices = [i for i, l in enumerate(labels) if l == label]
-            abebooks_count = sum(1 for i in indices if i < n_abebooks)
-            amazon_count = sum(1 for i in indices if i >= n_abebooks)
+        # 统计每个聚类中两个来源的分布（np.bincount 一次统计所有簇）
+        import numpy as np
+
+        labels_arr = np.asarray(labels)
+        clustered = labels_arr >= 0
+        from_abebooks = np.arange(len(labels_arr)) < n_abebooks
+        cluster_sizes = np.bincount(labels_arr[clustered])
+        abebooks_counts = np.bincount(
+            labels_arr[clustered], weights=from_abebooks[clustered], minlength=len(cluster_sizes)
+        ).astype(int)
+        amazon_counts = cluster_sizes - abebooks_counts
+        unique_labels = np.flatnonzero(cluster_sizes)
+        purities = np.maximum(abebooks_counts, amazon_counts)[unique_labels] / cluster_sizes[unique_labels]
+
+        for label, purity in zip(unique_labels, purities):
+            abebooks_count = abebooks_counts[label]
+            amazon_count = amazon_counts[label]
+            size = cluster_sizes[label]
 
             print(f"聚类 {label}:")
-            print(f"  abebooks: {abebooks_count} 个 ({abebooks_count/len(indices)*100:.1f}%)")
-            print(f"  amazon: {amazon_count} 个 ({amazon_count/len(indices)*100:.1f}%)")
+            print(f"  abebooks: {abebooks_count} 个 ({abebooks_count/size*100:.1f}%)")
+            print(f"  amazon: {amazon_count} 个 ({amazon_count/size*100:.1f}%)")
 
             # 判断这个聚类的主要来源
             if abebooks_count > amazon_count:
-                purity = abebooks_count / len(indices)
                 print(f"  纯度: {purity:.2%} (主要为abebooks)")
             else:
-                purity = amazon_count / len(indices)
                 print(f"  纯度: {purity:.2%} (主要为amazon)")
 
         # 断言：应该聚类为2-4个簇
@@ -261,13 +274,7 @@ class TestCluster:
         assert 2 <= n_clusters <= 4, f"两个网站应该聚类为2-4个簇，实际: {n_clusters}"
 
         # 断言：每个簇的纯度应该较高（> 70%）
-        min_purity = 1.0
-        for label in unique_labels:
-            indices = [i for i, l in enumerate(labels) if l == label]
-            abebooks_count = sum(1 for i in indices if i < n_abebooks)
-            amazon_count = sum(1 for i in indices if i >= n_abebooks)
-            purity = max(abebooks_count, amazon_count) / len(indices)
-            min_purity = min(min_purity, purity)
+        min_purity = purities.min()
 
         print(f"断言检查: 最小聚类纯度 = {min_purity:.2%}, 预期 > 70%")
         assert min_purity > 0.70, f"聚类纯度不足: {min_purity:.2%}"
@@ -296,6 +303,39 @@ class TestCluster:
         assert sim_mat.shape == (1, 1)
         assert sim_mat[0, 0] == 1.0
 
+    @staticmethod
+    def _synthetic_page(seed: int) -> str:
+        """生成前几层结构随 seed 变化的HTML页面（区块标签、class 属性和数量各不相同）"""
+        block_tags = ["div", "section", "article", "aside"]
+        blocks = "".join(
+            f'<{block_tags[(seed + i) % 4]} class="block-{(seed * i) % 5}">'
+            + "".join(f'<span class="t{j % 3}">{j}</span>' for j in range((seed + i) % 3 + 1))
+            + f"</{block_tags[(seed + i) % 4]}>"
+            for i in range(seed % 4 + 1)
+        )
+        header = f'<header class="top-{seed % 3}"><h1>标题</h1></header>' if seed % 2 else ""
+        return f'<html><body>{header}<main id="m{seed % 2}">{blocks}</main><footer>页脚</footer></body></html>'
+
+    @pytest.mark.unit
+    def test_similarity_matrix_matches_pairwise_similarity(self):
+        """测试: 矩阵化的相似度矩阵与逐对调用 similarity 的结果一致"""
+        from web2json.tools.cluster import _build_similarity_matrix, _compute_features
+
+        html_list = [self._synthetic_page(seed) for seed in range(12)]
+        features = _compute_features(html_list)
+        sim_mat = _build_similarity_matrix(features)
+
+        n = len(features)
+        assert sim_mat.shape == (n, n)
+        assert np.all(np.diag(sim_mat) == 1.0)
+        for i in range(n):
+            for j in range(i + 1, n):
+                # 与聚类逻辑一致：两页的 layer_n 取平均再取整
+                layer_n = int((features[i]["max_width_layer"] + features[j]["max_width_layer"]) / 2)
+                expected = min(max(similarity(features[i], features[j], layer_n=layer_n), 0.0), 1.0)
+                assert sim_mat[i, j] == pytest.approx(expected, abs=1e-6)
+                assert sim_mat[j, i] == sim_mat[i, j]
+
 
 if __name__ == "__main__":
     # 允许直接运行测试文件
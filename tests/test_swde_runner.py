@@ -0,0 +1,216 @@
+"""
+SWDE评测运行器单元测试
+测试 summary.jsonl 的断点续跑重放、综合报告的摘要跳过，以及中断时 agent 子进程的终止
+"""
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from evaluation import run_swde_evaluation
+from evaluation.run_swde_evaluation import SUMMARY_LOG_FILE, SWDEEvaluationRunner
+
+
+def _make_results(website: str, f1: float, with_pages: bool = True) -> dict:
+    """构造一个网站的评测结果；with_pages=False 时只保留断点续跑时的精简摘要字段"""
+    results = {
+        'website': website,
+        'overall_metrics': {'precision': f1, 'recall': f1, 'f1': f1},
+        'statistics': {'evaluated_pages': 2, 'errors': 0},
+        'attribute_metrics': {'title': {'precision': f1, 'recall': f1, 'f1': f1}},
+    }
+    if with_pages:
+        results['page_results'] = [{'page_id': '0000', 'f1': f1}, {'page_id': '0001', 'f1': f1}]
+    return results
+
+
+@pytest.mark.unit
+class TestSWDERunner:
+    """SWDEEvaluationRunner 测试类"""
+
+    @pytest.fixture
+    def make_runner(self, tmp_path):
+        """创建指向临时目录的运行器，测试结束时终止残留的 agent 进程"""
+        runners = []
+
+        def _make(**kwargs):
+            runner = SWDEEvaluationRunner(
+                dataset_dir=str(tmp_path / "dataset"),
+                groundtruth_dir=str(tmp_path / "groundtruth"),
+                output_root=str(tmp_path / "output"),
+                show_progress=False,
+                **kwargs
+            )
+            runners.append(runner)
+            return runner
+
+        yield _make
+        for runner in runners:
+            runner.terminate_agent_processes()
+            runner._eval_executor.shutdown(wait=False)
+
+    def test_summary_log_replayed_on_resume(self, make_runner):
+        """测试: summary.json 之后追加到 summary.jsonl 的网站条目在重启时被重放"""
+        runner = make_runner()
+        runner._update_global_summary('book', 'abebooks', _make_results('abebooks', 0.8))
+        runner.flush_global_summary()
+        # 保存 summary.json 之后完成的网站只写入了 summary.jsonl
+        runner._update_global_summary('book', 'amazon', _make_results('amazon', 0.4))
+        runner._summary_log.close()
+
+        resumed = make_runner(resume=True)
+        book = resumed.global_summary['verticals']['book']
+        assert set(book['websites']) == {'abebooks', 'amazon'}
+        assert book['metrics']['f1'] == pytest.approx(0.6)
+        assert resumed.global_summary['overall']['completed_websites'] == 2
+        assert resumed._dirty_count == 1
+
+    def test_summary_log_replay_skips_torn_line(self, make_runner):
+        """测试: 中断追加留下的残缺行被跳过，已写入 summary.json 的条目不会重复计入"""
+        runner = make_runner()
+        runner._update_global_summary('book', 'abebooks', _make_results('abebooks', 0.8))
+        runner.flush_global_summary()
+        runner._summary_log.close()
+        with open(runner.output_root / SUMMARY_LOG_FILE, 'a', encoding='utf-8') as f:
+            f.write('{"vertical": "book", "website": "amaz')
+
+        resumed = make_runner(resume=True)
+        assert resumed._dirty_count == 0
+        assert resumed.global_summary['overall']['completed_websites'] == 1
+        assert resumed._overall_sums['f1'] == pytest.approx(0.8)
+
+    def test_summary_log_compacted_after_summary_written(self, make_runner):
+        """测试: 写入 summary.json 后，已并入的条目从 summary.jsonl 中删除，其他进程追加的未并入条目保留"""
+        runner = make_runner()
+        log_file = runner.output_root / SUMMARY_LOG_FILE
+        runner._update_global_summary('book', 'abebooks', _make_results('abebooks', 0.8))
+        # 模拟 --jobs 工作进程追加的、尚未合并到本进程汇总中的条目
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'vertical': 'auto', 'website': 'aol', 'timestamp': '9999-01-01T00:00:00',
+                'precision': 0.5, 'recall': 0.5, 'f1': 0.5, 'evaluated_pages': 1, 'errors': 0,
+                'attribute_metrics': {}
+            }) + '\n')
+        runner.flush_global_summary()
+
+        records = [json.loads(line) for line in log_file.read_text(encoding='utf-8').splitlines()]
+        assert [(r['vertical'], r['website']) for r in records] == [('auto', 'aol')]
+
+    def test_leftover_summary_log_discarded_without_summary(self, make_runner):
+        """测试: 删除 summary.json 重新开始时，旧的 summary.jsonl 不会被重放到新汇总中"""
+        runner = make_runner()
+        runner._update_global_summary('book', 'abebooks', _make_results('abebooks', 0.8))
+        runner._summary_log.close()
+        runner.global_summary_file.unlink()
+
+        fresh = make_runner(resume=True)
+        assert fresh.global_summary['verticals'] == {}
+        assert fresh._dirty_count == 0
+        assert not (fresh.output_root / SUMMARY_LOG_FILE).exists()
+        assert fresh.global_summary_file.exists()
+
+    def test_resume_plan_drives_completion_checks(self, make_runner):
+        """测试: 断点续跑计划只保留未完成的网站，之后的完成检查和进度条总数都以计划为准"""
+        runner = make_runner()
+        runner._update_global_summary('book', 'abebooks', _make_results('abebooks', 0.8))
+        runner.flush_global_summary()
+        runner._summary_log.close()
+        website_dir = runner.output_root / 'book' / 'abebooks'
+        (website_dir / 'result').mkdir(parents=True)
+        (website_dir / 'result' / '0000.json').write_text('{}', encoding='utf-8')
+        (website_dir / 'evaluation').mkdir()
+        (website_dir / 'evaluation' / run_swde_evaluation.REPORT_FILE).write_text('{}', encoding='utf-8')
+
+        resumed = make_runner(resume=True)
+        remaining = resumed.plan_resume([('book', 'abebooks'), ('book', 'amazon')])
+        assert remaining == [('book', 'amazon')]
+        assert resumed._pbar.total == 1
+        assert resumed._is_website_completed('book', 'abebooks')
+        assert not resumed._is_website_completed('book', 'amazon')
+
+    def test_integrated_report_skipped_when_results_unchanged(self, tmp_path, monkeypatch):
+        """测试: 结果摘要与上次相同时不重新生成综合报告，结果变化时重新生成"""
+        from evaluation.visualization import EvaluationReporter
+
+        calls = []
+
+        def fake_report(results, output_file):
+            calls.append(results)
+            Path(output_file).write_text('<html></html>', encoding='utf-8')
+
+        monkeypatch.setattr(EvaluationReporter, 'generate_integrated_report', staticmethod(fake_report))
+        output_file = tmp_path / "integrated_error_report.html"
+        results = [_make_results('abebooks', 0.8), _make_results('amazon', 0.4)]
+
+        run_swde_evaluation._generate_integrated_report(results, output_file)
+        # 字典键顺序不同但内容相同，摘要一致
+        reordered = [dict(reversed(list(r.items()))) for r in results]
+        run_swde_evaluation._generate_integrated_report(reordered, output_file)
+        assert len(calls) == 1
+
+        results[1] = _make_results('amazon', 0.5)
+        run_swde_evaluation._generate_integrated_report(results, output_file)
+        assert len(calls) == 2
+
+    def test_finalize_vertical_loads_full_results_for_resumed_websites(self, make_runner, monkeypatch):
+        """测试: 断点续跑跳过的网站只有精简摘要，综合报告使用从 results.json 读取的完整结果"""
+        runner = make_runner(resume=True)
+        full = _make_results('amazon', 0.4)
+        report_dir = runner.output_root / 'book' / 'amazon' / 'evaluation'
+        report_dir.mkdir(parents=True)
+        (report_dir / run_swde_evaluation.REPORT_FILE).write_text(json.dumps(full), encoding='utf-8')
+
+        reported = []
+        monkeypatch.setattr(
+            run_swde_evaluation, '_generate_integrated_report',
+            lambda results, output_file: reported.append(results)
+        )
+        fresh = _make_results('abebooks', 0.8)
+        final = runner._finalize_vertical('book', [fresh, _make_results('amazon', 0.4, with_pages=False)])
+
+        assert final == [fresh, full]
+        assert reported == [[fresh, full]]
+
+    def test_agent_process_terminated_on_timeout(self, make_runner):
+        """测试: agent 超时后其进程被终止，并且不再登记在运行中的进程集合里"""
+        runner = make_runner()
+        cmd = [sys.executable, '-c', 'import time; time.sleep(30)']
+
+        start = time.monotonic()
+        with pytest.raises(run_swde_evaluation.subprocess.TimeoutExpired):
+            runner._run_agent_process(cmd, 'book/abebooks', timeout=1)
+        assert time.monotonic() - start < 10
+        assert not runner._agent_procs
+
+    def test_terminate_agent_processes_stops_running_agents(self, make_runner):
+        """测试: 中断时 terminate_agent_processes 终止正在运行的 agent，之后不再启动新的 agent"""
+        runner = make_runner()
+        cmd = [sys.executable, '-c', 'import time; time.sleep(30)']
+        outcome = {}
+
+        def run():
+            outcome['returncode'] = runner._run_agent_process(cmd, 'book/abebooks', timeout=60)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        deadline = time.monotonic() + 10
+        while not runner._agent_procs and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert runner._agent_procs
+
+        runner.terminate_agent_processes()
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+        assert outcome['returncode'] != 0
+        assert not runner._agent_procs
+
+        with pytest.raises(RuntimeError):
+            runner._run_agent_process(cmd, 'book/amazon', timeout=60)
+        assert not runner._agent_procs
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
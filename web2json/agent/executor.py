@@ -3,7 +3,7 @@ Agent 执行器
 负责阶段编排和流程控制（重构简化版）
 """
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from loguru import logger
 
@@ -152,13 +152,19 @@ class AgentExecutor:
 
         return results
 
-    def parse_all_html_files(self, html_files: List[str], parser_path: str) -> Dict:
+    def parse_all_html_files(
+        self,
+        html_files: List[str],
+        parser_path: str,
+        html_contents: Optional[Dict[str, str]] = None
+    ) -> Dict:
         """
         使用生成的解析器批量解析所有HTML文件
 
         Args:
             html_files: 所有HTML文件路径列表
             parser_path: 解析器文件路径
+            html_contents: 已读入内存的HTML内容（按文件路径），可选，避免重复读文件
 
         Returns:
             批量解析结果
@@ -166,4 +172,5 @@ class AgentExecutor:
         return self.parser_processor.process({
             'html_files': html_files,
             'parser_path': parser_path,
+            'html_contents': html_contents,
         })
@@ -44,7 +44,8 @@ class ParserAgent:
         domain: str = None,
         iteration_rounds: int = None,
         schema_mode: str = None,
-        schema_template: str = None
+        schema_template: str = None,
+        html_contents: Dict[str, str] = None
     ) -> Dict:
         """
         生成解析器
@@ -63,6 +64,7 @@ class ParserAgent:
             iteration_rounds: 迭代轮数（用于Schema学习的样本数量），默认为3
             schema_mode: Schema模式 (auto/predefined)，覆盖初始化时的设置
             schema_template: 预定义schema模板文件路径（JSON格式）
+            html_contents: 调用方已读入内存的HTML内容（按文件路径），可选，批量解析时不再重复读取这些文件
 
         Returns:
             生成结果
@@ -123,7 +125,8 @@ class ParserAgent:
 
         parse_result = self.executor.parse_all_html_files(
             html_files=all_html_files,
-            parser_path=parser_path
+            parser_path=parser_path,
+            html_contents=html_contents
         )
 
         # 第四步：总结
@@ -34,6 +34,7 @@ class ParserProcessor(BaseProcessor):
             input_data: {
                 'html_files': List[str],  # HTML 文件路径列表
                 'parser_path': str,       # 解析器文件路径
+                'html_contents': Dict[str, str],  # 可选，已读入内存的 HTML 内容（按路径），命中时不再读文件
             }
 
         Returns:
@@ -47,6 +48,7 @@ class ParserProcessor(BaseProcessor):
         """
         html_files = input_data['html_files']
         parser_path = input_data['parser_path']
+        html_contents = input_data.get('html_contents') or {}
 
         logger.info(f"\n{'='*70}")
         logger.info(f"批量解析阶段：解析 {len(html_files)} 个 HTML 文件")
@@ -70,9 +72,11 @@ class ParserProcessor(BaseProcessor):
                     html_path = Path(html_file_path)
 
                     try:
-                        # 读取 HTML 内容
-                        with open(html_path, 'r', encoding='utf-8') as f:
-                            html_content = f.read()
+                        # 读取 HTML 内容（优先使用调用方已读入内存的内容）
+                        html_content = html_contents.get(html_file_path)
+                        if html_content is None:
+                            with open(html_path, 'r', encoding='utf-8') as f:
+                                html_content = f.read()
 
                         # 使用解析器解析 HTML
                         parsed_data = parser.parse(html_content)
@@ -189,7 +189,10 @@ def cmd_generate(args):
         main as main_func,
         setup_logger,
         read_html_files_from_directory,
-        generate_parsers_by_layout_clusters
+        generate_parsers_by_layout_clusters,
+        compute_parser_cache_key,
+        load_cached_parser,
+        save_parser_to_cache
     )
     from web2json.agent import ParserAgent
     from loguru import logger
@@ -245,6 +248,23 @@ def cmd_generate(args):
         )
         return
 
+    # 相同输入之前已生成过解析器时直接复用
+    cache_key = None
+    if not getattr(args, 'no_cache', False):
+        cache_key = compute_parser_cache_key(
+            html_files,
+            args.domain,
+            getattr(args, 'iteration_rounds', None),
+            schema_mode,
+            schema_template
+        )
+        cached = load_cached_parser(args.output, cache_key)
+        if cached:
+            logger.success("\n✓ 复用缓存的解析器（输入未变化）")
+            logger.info(f"  解析器路径: {cached['parser_path']}")
+            logger.info(f"  配置路径: {cached['config_path']}")
+            return
+
     # 创建Agent
     agent = ParserAgent(output_dir=args.output)
 
@@ -262,6 +282,8 @@ def cmd_generate(args):
         logger.success("\n✓ 解析器生成成功!")
         logger.info(f"  解析器路径: {result['parser_path']}")
         logger.info(f"  配置路径: {result['config_path']}")
+        if cache_key:
+            save_parser_to_cache(args.output, cache_key, result)
 
     else:
         logger.error("\n✗ 解析器生成失败")
@@ -360,6 +382,11 @@ def main():
         action='store_true',
         help='是否按布局聚类分别生成解析器（默认: 否，使用全部HTML生成单个解析器）'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='不复用之前相同输入生成的解析器，强制重新生成'
+    )
     parser.add_argument(
         '--skip-config-check',
         action='store_true',
@@ -61,6 +61,7 @@ class Settings(BaseModel):
     # 并发控制
     max_concurrent_extractions: int = Field(default_factory=lambda: int(os.getenv("MAX_CONCURRENT_EXTRACTIONS", "5")))
     max_concurrent_merges: int = Field(default_factory=lambda: int(os.getenv("MAX_CONCURRENT_MERGES", "5")))
+    max_concurrent_clusters: int = Field(default_factory=lambda: int(os.getenv("MAX_CONCURRENT_CLUSTERS", "2")))
 
     # ============================================
     # 布局聚类配置
@@ -75,6 +76,8 @@ class Settings(BaseModel):
     headless: bool = Field(default_factory=lambda: os.getenv("HEADLESS", "true").lower() == "true")
     timeout: int = Field(default_factory=lambda: int(os.getenv("TIMEOUT", "30000")))
     screenshot_full_page: bool = Field(default_factory=lambda: os.getenv("SCREENSHOT_FULL_PAGE", "true").lower() == "true")
+    # 截图时是否加载图片和远程字体（关闭可显著加快图片较多页面的加载）
+    screenshot_load_images: bool = Field(default_factory=lambda: os.getenv("SCREENSHOT_LOAD_IMAGES", "true").lower() == "true")
 
     # ============================================
     # HTML精简配置
@@ -96,6 +99,7 @@ class Settings(BaseModel):
     swde_skip_agent: bool = Field(default_factory=lambda: os.getenv("SWDE_SKIP_AGENT", "false").lower() in ("true", "1", "yes"))
     swde_skip_evaluation: bool = Field(default_factory=lambda: os.getenv("SWDE_SKIP_EVALUATION", "false").lower() in ("true", "1", "yes"))
     swde_force: bool = Field(default_factory=lambda: os.getenv("SWDE_FORCE", "false").lower() in ("true", "1", "yes"))
+    swde_max_parallel: int = Field(default_factory=lambda: int(os.getenv("SWDE_MAX_PARALLEL", "1")))
 
     class Config:
         """Pydantic配置"""
@@ -2,9 +2,16 @@
 HtmlParserAgent 主程序
 通过给定HTML文件目录，自动生成网页解析代码
 """
+import os
 import sys
+import json
+import shutil
+import hashlib
 import argparse
 import warnings
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from loguru import logger
 from web2json.agent import ParserAgent
@@ -14,6 +21,9 @@ from web2json.tools.cluster import cluster_html_layouts, cluster_html_layouts_op
 warnings.filterwarnings('ignore', message='.*LangSmith now uses UUID v7.*')
 warnings.filterwarnings('ignore', category=UserWarning, module='pydantic.v1.main')
 
+# 解析器生成缓存目录（位于输出目录下，按输入内容的哈希分子目录）
+PARSER_CACHE_DIR = ".cache"
+
 
 def setup_logger():
     """配置日志"""
@@ -51,12 +61,13 @@ def read_html_files_from_directory(directory_path: str) -> list:
             logger.error(f"路径不是一个目录: {directory_path}")
             sys.exit(1)
 
-        # 查找所有HTML文件
-        for ext in ['*.html', '*.htm']:
-            html_files.extend(dir_path.glob(ext))
-
-        # 转换为绝对路径字符串并排序
-        html_files = sorted([str(f.absolute()) for f in html_files])
+        # 单次 scandir 遍历查找所有HTML文件，直接拼接绝对路径（无需逐个 stat）
+        base = os.path.abspath(dir_path)
+        with os.scandir(base) as entries:
+            for entry in entries:
+                if entry.name.endswith(('.html', '.htm')) and entry.is_file():
+                    html_files.append(os.path.join(base, entry.name))
+        html_files.sort()
 
         if not html_files:
             logger.error(f"目录中没有找到HTML文件: {directory_path}")
@@ -68,6 +79,133 @@ def read_html_files_from_directory(directory_path: str) -> list:
         sys.exit(1)
 
 
+@lru_cache(maxsize=1)
+def _prompts_digest() -> str:
+    """web2json/prompts 下所有 Prompt 模块内容的 sha256（进程内只计算一次）"""
+    prompts_dir = Path(__file__).parent / "prompts"
+    digest = hashlib.sha256()
+    for path in sorted(prompts_dir.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def compute_parser_cache_key(
+    html_files: list,
+    domain: str | None = None,
+    iteration_rounds: int | None = None,
+    schema_mode: str | None = None,
+    schema_template: dict | None = None,
+) -> str:
+    """根据输入计算解析器生成缓存的键
+
+    键由所有HTML文件内容的 sha256（排序后，与文件顺序无关）以及域名、迭代轮数、
+    Schema模式和Schema模板共同决定，任一输入变化都会得到不同的键。
+    未传入的迭代轮数和Schema模式按 .env 中的默认值（与 Agent 实际使用的值一致）计入；
+    生成所用的模型、温度以及 Prompt 模块内容也计入键中，修改 .env 中的这些配置
+    或 Prompt 后不会命中旧的解析器。
+
+    Args:
+        html_files: HTML文件路径列表
+        domain: 域名（可选）
+        iteration_rounds: 迭代轮数
+        schema_mode: Schema模式
+        schema_template: 预定义的Schema模板
+
+    Returns:
+        缓存键（十六进制字符串）
+    """
+    from web2json.config.settings import settings
+
+    file_digests = sorted(hashlib.sha256(Path(p).read_bytes()).hexdigest() for p in html_files)
+    key = hashlib.sha256()
+    for digest in file_digests:
+        key.update(digest.encode())
+    # 与 ParserOrchestrator / ParserPlanner 一样，未指定时使用 .env 中的默认值
+    if iteration_rounds is None:
+        iteration_rounds = settings.default_iteration_rounds
+    schema_mode = schema_mode or settings.schema_mode
+    key.update(json.dumps(
+        [domain, iteration_rounds, schema_mode, schema_template],
+        sort_keys=True, ensure_ascii=False
+    ).encode('utf-8'))
+    # 影响生成结果的模型配置
+    key.update(json.dumps([
+        settings.default_model, settings.default_temperature,
+        settings.agent_model, settings.agent_temperature,
+        settings.code_gen_model, settings.code_gen_temperature,
+        settings.vision_model, settings.vision_temperature,
+    ]).encode('utf-8'))
+    key.update(_prompts_digest().encode())
+    return key.hexdigest()
+
+
+def load_cached_parser(output_dir: str, cache_key: str) -> dict | None:
+    """查找之前相同输入生成的解析器
+
+    命中时若输出目录中的解析器或配置文件已被删除，则从缓存中恢复。
+
+    Args:
+        output_dir: 输出目录
+        cache_key: compute_parser_cache_key 计算出的缓存键
+
+    Returns:
+        缓存的生成结果；未命中时返回 None
+    """
+    cache_dir = Path(output_dir) / PARSER_CACHE_DIR / cache_key
+    result_file = cache_dir / "result.json"
+    if not result_file.exists():
+        return None
+
+    try:
+        with open(result_file, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+        for key in ('parser_path', 'config_path'):
+            if not result.get(key):
+                continue
+            target = Path(result[key])
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(cache_dir / target.name, target)
+        if result.get('results_dir') and not Path(result['results_dir']).exists():
+            return None
+    except Exception as e:
+        logger.warning(f"读取解析器缓存失败，将重新生成: {e}")
+        return None
+
+    return result
+
+
+def save_parser_to_cache(output_dir: str, cache_key: str, result: dict) -> None:
+    """缓存成功生成的解析器，供相同输入的后续运行直接复用
+
+    Args:
+        output_dir: 输出目录
+        cache_key: compute_parser_cache_key 计算出的缓存键
+        result: agent.generate_parser 的成功结果
+    """
+    cache_dir = Path(output_dir) / PARSER_CACHE_DIR / cache_key
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cached = {'success': True, 'summary': result.get('summary')}
+        for key in ('parser_path', 'config_path', 'results_dir'):
+            value = result.get(key)
+            cached[key] = str(Path(value).absolute()) if value else None
+        for key in ('parser_path', 'config_path'):
+            if cached[key]:
+                shutil.copy2(cached[key], cache_dir / Path(cached[key]).name)
+        with open(cache_dir / "result.json", 'w', encoding='utf-8') as f:
+            json.dump(cached, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        logger.warning(f"写入解析器缓存失败: {e}")
+
+
+def _read_html_file(file_path: str) -> str:
+    """读取单个HTML文件内容"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
 def generate_parsers_by_layout_clusters(
     html_files: list,
     base_output: str,
@@ -101,10 +239,12 @@ def generate_parsers_by_layout_clusters(
     # 读取HTML内容用于聚类
     logger.info(f"正在读取 {len(html_files)} 个HTML文件...")
     html_contents = []
-    for file_path in html_files:
+    # 文件读取是 I/O 密集型，用线程池并行读取
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(html_files)))) as executor:
+        futures = [executor.submit(_read_html_file, file_path) for file_path in html_files]
+    for file_path, future in zip(html_files, futures):
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                html_contents.append(f.read())
+            html_contents.append(future.result())
         except Exception as e:
             logger.error(f"读取文件失败 {file_path}: {e}")
             sys.exit(1)
@@ -120,6 +260,9 @@ def generate_parsers_by_layout_clusters(
         logger.error(f"聚类失败: {e}")
         sys.exit(1)
 
+    # 聚类前已读入的内容，供各簇批量解析时复用，避免再次读取文件
+    html_contents_by_path = dict(zip(html_files, html_contents))
+
     # 统计聚类结果
     unique_labels = sorted(set(labels))
     noise_count = sum(1 for l in labels if l == -1)
@@ -132,13 +275,13 @@ def generate_parsers_by_layout_clusters(
     logger.info(f"  噪声点（未归类）: {noise_count}")
     logger.info("-"*70)
 
-    # 为每个簇输出详细信息
+    # 为每个簇输出详细信息（一次遍历统计各簇大小）
+    cluster_sizes = Counter(labels)
     for lbl in unique_labels:
-        cluster_files = [p for p, l in zip(html_files, labels) if l == lbl]
         if lbl == -1:
-            logger.info(f"噪声点 (label=-1): {len(cluster_files)} 个文件")
+            logger.info(f"噪声点 (label=-1): {cluster_sizes[lbl]} 个文件")
         else:
-            logger.info(f"簇 {lbl}: {len(cluster_files)} 个文件")
+            logger.info(f"簇 {lbl}: {cluster_sizes[lbl]} 个文件")
 
     logger.info("="*70)
 
@@ -168,13 +311,13 @@ def generate_parsers_by_layout_clusters(
         logger.warning(f"保存聚类信息失败: {e}")
 
     # 针对每个簇分别创建 Agent 并生成解析器
-    any_failure = False
-    successful_clusters = []
+    files_by_label = {lbl: [] for lbl in unique_labels}
+    for file_path, lbl in zip(html_files, labels):
+        files_by_label[lbl].append(file_path)
 
-    for lbl in unique_labels:
-        cluster_files = [p for p, l in zip(html_files, labels) if l == lbl]
-        if not cluster_files:
-            continue
+    def generate_for_cluster(lbl):
+        """为单个簇生成解析器，返回 (簇名称, 生成结果)；异常时结果为 None"""
+        cluster_files = files_by_label[lbl]
 
         # 为噪声点使用特殊命名
         if lbl == -1:
@@ -207,19 +350,33 @@ def generate_parsers_by_layout_clusters(
             result = agent.generate_parser(
                 html_files=cluster_files,
                 domain=domain,
+                html_contents=html_contents_by_path,
             )
+        except Exception as e:
+            logger.error(f"\n✗ {cluster_name}的解析器生成失败: {e}")
+            return cluster_name, None
+
+        if result['success']:
+            logger.success(f"\n✓ {cluster_name}的解析器生成成功!")
+        else:
+            logger.error(f"\n✗ {cluster_name}的解析器生成失败")
+            if 'error' in result:
+                logger.error(f"  错误: {result['error']}")
+        return cluster_name, result
 
-            if result['success']:
-                logger.success(f"\n✓ {cluster_name}的解析器生成成功!")
+    # 各簇相互独立，主要耗时在 LLM 调用上，用线程池并发生成（并发数见 MAX_CONCURRENT_CLUSTERS）
+    any_failure = False
+    successful_clusters = []
+
+    cluster_labels = [lbl for lbl in unique_labels if files_by_label[lbl]]
+    max_workers = max(1, min(settings.max_concurrent_clusters, len(cluster_labels)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # executor.map 按簇标签顺序返回结果
+        for lbl, (cluster_name, result) in zip(cluster_labels, executor.map(generate_for_cluster, cluster_labels)):
+            if result is not None and result['success']:
                 successful_clusters.append((lbl, cluster_name, result))
             else:
                 any_failure = True
-                logger.error(f"\n✗ {cluster_name}的解析器生成失败")
-                if 'error' in result:
-                    logger.error(f"  错误: {result['error']}")
-        except Exception as e:
-            any_failure = True
-            logger.error(f"\n✗ {cluster_name}的解析器生成失败: {e}")
 
     # 输出总结
     logger.info("\n" + "="*70)
@@ -279,6 +436,11 @@ def main():
         default=3,
         help='迭代轮数（用于Schema学习的样本数量，默认: 3）'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='不复用之前相同输入生成的解析器，强制重新生成'
+    )
 
     args = parser.parse_args()
 
@@ -297,6 +459,15 @@ def main():
         )
         return
 
+    # 相同输入之前已生成过解析器时直接复用
+    cache_key = None
+    if not args.no_cache:
+        cache_key = compute_parser_cache_key(html_files, args.domain, args.iteration_rounds)
+        cached = load_cached_parser(args.output, cache_key)
+        if cached:
+            logger.success(f"✓ 复用缓存的解析器: {cached['parser_path']}")
+            return
+
     # 创建Agent
     agent = ParserAgent(output_dir=args.output)
 
@@ -314,6 +485,9 @@ def main():
             logger.error(f"  错误: {result['error']}")
         sys.exit(1)
 
+    if cache_key:
+        save_parser_to_cache(args.output, cache_key, result)
+
 
 if __name__ == "__main__":
     main()
@@ -7,7 +7,11 @@ from typing import Dict
 
 
 class CodeGeneratorPrompts:
-    """代码生成器 Prompt 模板类"""
+    """代码生成器 Prompt 模板类
+
+    固定的指令部分放在 Prompt 开头，目标结构、HTML 等随调用变化的内容放在末尾，
+    使多次调用共享相同前缀，便于命中 LLM 服务端的前缀缓存（prompt caching）。
+    """
 
     @staticmethod
     def get_initial_generation_prompt(html_content: str, target_json: Dict) -> str:
@@ -28,25 +32,15 @@ class CodeGeneratorPrompts:
         return f"""
 你是一个专业的HTML解析代码生成器。请根据以下信息生成一个Python类，用于解析同类网页。
 
-## 目标结构
-需要提取以下字段（JSON格式）：
-```json
-{json.dumps(target_json, ensure_ascii=False, indent=2)}
-```
-
-## HTML示例
-```html
-{html_content}
-```
-
 ## 要求
 1. 生成一个名为 `WebPageParser` 的Python类
-2. 使用 BeautifulSoup 和 lxml 进行解析
+2. 优先直接使用 lxml 解析（`lxml.html.fromstring`）并用 XPath 提取；仅在确需模糊文本匹配时才使用 BeautifulSoup，此时必须指定 `'lxml'` 解析器，并用 `SoupStrainer` 只解析需要的部分，查找时优先用 `.find()` 而非 `.select()`
 3. 实现 `parse(html: str) -> dict` 方法
-4. 为每个字段编写提取逻辑，使用CSS选择器或XPath
+4. 为每个字段编写提取逻辑，优先使用XPath，必要时使用CSS选择器
 5. 尽量使用类名、ID等稳定属性，避免使用绝对索引
 6. 代码尽量简洁，减少冗余
 7. 添加适当的错误处理
+8. 每次 `parse()` 只调用一次 `lxml.html.fromstring(html)`，不要按字段重复解析；固定不变的XPath建议在类级别预编译（`from lxml.etree import XPath`），如 `_SEL_TITLE = XPath('//h1[@class="title"]/text()')`，备选、相对或依条件拼接的选择器可直接使用 `tree.xpath(...)`，以提取准确为先
 
 ## 输出格式 - 重要！
 **严格要求：**
@@ -110,6 +104,17 @@ if __name__ == '__main__':
 ```
 
 **注意：必须完整实现上述结构，不要省略任何部分！**
+
+## 目标结构
+需要提取以下字段（JSON格式）：
+```json
+{json.dumps(target_json, ensure_ascii=False, separators=(',', ':'))}
+```
+
+## HTML示例
+```html
+{html_content}
+```
 """
 
     @staticmethod
@@ -138,27 +143,6 @@ if __name__ == '__main__':
         return f"""
 你是一个专业的HTML解析代码优化师。你需要根据新的HTML样本和更新的字段列表，优化和补充之前生成的解析代码。
 
-## 当前轮次信息
-轮次: {round_num}
-任务: 补充和优化现有解析代码
-
-## 前一轮生成的解析代码
-```python
-{previous_parser_code[:2000]}
-...（部分代码）
-```
-
-## 新的HTML示例
-```html
-{html_content}
-```
-
-## 更新的目标结构
-需要提取以下字段（JSON格式）：
-```json
-{json.dumps(target_json, ensure_ascii=False, indent=2)}
-```
-
 ## 优化要求
 1. 保留前一轮代码中已有的、正确的字段提取逻辑（函数形式）
 2. 添加在前一轮中遗漏的新字段提取逻辑
@@ -166,6 +150,8 @@ if __name__ == '__main__':
 4. 代码尽量简洁，减少冗余
 5. 添加适当的错误处理
 6. main函数是固定的，不要修改
+7. 优先直接使用 lxml（`lxml.html.fromstring`）和 XPath 提取；若前一轮代码使用 BeautifulSoup，可改写为 lxml，确需保留时必须指定 `'lxml'` 解析器并用 `SoupStrainer` 只解析需要的部分
+8. 每次 `parse()` 只调用一次 `lxml.html.fromstring(html)`；固定不变的XPath建议在类级别预编译（`from lxml.etree import XPath`），备选、相对或依条件拼接的选择器可直接使用 `tree.xpath(...)`，以提取准确为先
 
 ## 输出格式 - 重要！
 **严格要求：**
@@ -229,6 +215,26 @@ if __name__ == '__main__':
     main()
 ```
 
+## 当前轮次信息
+轮次: {round_num}
+任务: 补充和优化现有解析代码
+
+## 前一轮生成的解析代码
+```python
+{previous_parser_code[:2000]}
+...（部分代码）
+```
+
+## 新的HTML示例
+```html
+{html_content}
+```
+
+## 更新的目标结构
+需要提取以下字段（JSON格式）：
+```json
+{json.dumps(target_json, ensure_ascii=False, separators=(',', ':'))}
+```
 """
 
     @staticmethod
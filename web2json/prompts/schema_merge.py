@@ -6,7 +6,11 @@ import json
 
 
 class SchemaMergePrompts:
-    """Schema合并Prompt模板类"""
+    """Schema合并Prompt模板类
+
+    固定的整合规则与输出格式放在 Prompt 开头，随调用变化的 Schema 列表放在末尾，
+    便于命中 LLM 服务端的前缀缓存。
+    """
 
     # HTML和视觉Schema合并Prompt已禁用，保留代码以备后用
     # @staticmethod
@@ -92,23 +96,19 @@ class SchemaMergePrompts:
         Returns:
             Prompt字符串
         """
-        schemas_str = ""
-        for idx, schema in enumerate(schemas, 1):
-            schema_json = json.dumps(schema, ensure_ascii=False, indent=2)
-            schemas_str += f"\n### HTML {idx} 的Schema\n\n```json\n{schema_json}\n```\n"
+        schemas_str = "".join(
+            f"\n### HTML {idx} 的Schema\n\n```json\n{json.dumps(schema, ensure_ascii=False, separators=(',', ':'))}\n```\n"
+            for idx, schema in enumerate(schemas, 1)
+        )
 
         return f"""你是一个专业的数据Schema整合专家。
 
 ## 任务目标
 
-现在有{len(schemas)}个不同网页的Schema，它们来自同一类型的网页（例如都是博客文章页）。
+现在有多个不同网页的Schema（见文末“输入的多个Schema”），它们来自同一类型的网页（例如都是博客文章页）。
 
 请分析这些Schema，进行筛选、合并和修正，输出一个最终的、鲁棒的Schema。
 
-## 输入的多个Schema
-
-{schemas_str}
-
 ## 整合规则
 
 1. **字段合并**：将多个Schema中的相同字段合并
@@ -163,4 +163,8 @@ class SchemaMergePrompts:
 3. **结构合理**：字段的层级关系要合理，元信息归属正确
 4. **输出完整**：必须是完整的、可解析的JSON格式
 5. **保持核心字段**：即使某个字段只在部分Schema中出现，如果它是核心字段（如标题、内容等），也要保留
-"""
+
+## 输入的多个Schema
+
+共{len(schemas)}个Schema：
+{schemas_str}"""
@@ -1,6 +1,10 @@
-from typing import List, Dict, Tuple, Optional
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple
 
 import numpy as np
+from scipy import sparse
 from sklearn.cluster import DBSCAN
 
 from sklearn.metrics.pairwise import cosine_similarity
@@ -10,16 +14,23 @@ from tqdm import tqdm
 
 from .html_layout_cosin import (
     get_feature,
-    similarity,
     __get_max_width_layer,
     __parse_valid_layer,
     fuse_features,
 )
 
 
+# 页面数低于该值时串行提取特征。子进程以 spawn 方式启动，需要重新导入 web2json.tools
+# 及其依赖，页面太少时这部分开销抵不过并行带来的收益
+_PARALLEL_FEATURE_MIN_PAGES = 100
+
+
 def _compute_features(html_list: List[str], show_progress: bool = False) -> List[Dict]:
     """从 HTML 源码列表中提取布局特征。
 
+    内容完全相同的 HTML 只提取一次，重复项共享同一个 feature 字典（下游只读取不修改）；
+    HTML 解析是 CPU 密集型操作，页面较多时用进程池并行提取。
+
     Args:
         html_list: 多个 HTML 源码字符串列表。
         show_progress: 是否显示进度条。
@@ -28,12 +39,80 @@ def _compute_features(html_list: List[str], show_progress: bool = False) -> List
         每个 HTML 对应的 feature 字典列表（get_feature 的返回值）。
     """
 
-    features: List[Dict] = []
-    iterator = tqdm(html_list, desc="提取特征", unit="页") if show_progress else html_list
-    for html in iterator:
-        feat = get_feature(html)
-        features.append(feat)
-    return features
+    # 去重：记录每个 HTML 在去重列表中的位置
+    unique_index: Dict[str, int] = {}
+    positions = [unique_index.setdefault(html, len(unique_index)) for html in html_list]
+    unique_htmls = list(unique_index)
+
+    workers = min(os.cpu_count() or 1, len(unique_htmls))
+    if len(unique_htmls) < _PARALLEL_FEATURE_MIN_PAGES or workers < 2:
+        iterator = tqdm(unique_htmls, desc="提取特征", unit="页") if show_progress else unique_htmls
+        unique_features = [get_feature(html) for html in iterator]
+    else:
+        chunksize = max(1, len(unique_htmls) // (4 * workers))
+        # 使用 spawn 而非默认的 fork：调用方进程里可能已有日志、HTTP 连接池或浏览器等线程，
+        # fork 只复制当前线程，子进程可能继承被锁住的锁而卡死
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            # executor.map 按输入顺序返回结果
+            results = executor.map(get_feature, unique_htmls, chunksize=chunksize)
+            if show_progress:
+                results = tqdm(results, total=len(unique_htmls), desc="提取特征", unit="页")
+            unique_features = list(results)
+
+    return [unique_features[pos] for pos in positions]
+
+
+def _max_width_layer(feature: Dict) -> int:
+    """读取 get_feature 预先算好的最大宽度层；外部传入的旧特征缺少该字段时现场计算"""
+    layer = feature.get("max_width_layer")
+    if layer is None:
+        layer = __get_max_width_layer(feature.get("tags", {}))
+    return layer
+
+
+def _layered_key_matrix(dicts: List[Dict]) -> sparse.csr_matrix:
+    """把每个页面的分层特征编码为稀疏矩阵：行是页面，列是 __simp_tags 生成的维度，值是该维度所在的层号。
+
+    __list_to_dict 中维度名为 "{序号}_{tag}"，序号是该层在页面特征字典中的位置。
+    特征字典按层号递增插入，因此层号 <= layer_n 的截断不会改变各层的序号，
+    任意 layer_n 下的维度集合都等于"层号 <= layer_n 的列"，只需编码一次。
+    """
+    vocab: Dict[str, int] = {}
+    indptr = [0]
+    indices: List[int] = []
+    data: List[int] = []
+    for d in dicts:
+        row: Dict[int, int] = {}
+        for rank, (layer, values) in enumerate(d.items()):
+            for value in values:
+                col = vocab.setdefault(f"{rank}_{value}", len(vocab))
+                row[col] = int(layer)
+        indices.extend(row.keys())
+        data.extend(row.values())
+        indptr.append(len(indices))
+
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.int32), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(dicts), max(len(vocab), 1)),
+    )
+
+
+def _mask_within_layer(layered: sparse.csr_matrix, layer_n: int) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """只保留层号 <= layer_n 的维度，返回 (0/1 稀疏矩阵, 每个页面的维度数)"""
+    mask = layered.copy()
+    mask.data = (mask.data <= layer_n).astype(np.float32)
+    mask.eliminate_zeros()
+    sizes = np.diff(mask.indptr).astype(np.float64)
+    return mask, sizes
+
+
+def _cosine_block(mask: sparse.csr_matrix, sizes: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """计算 rows × cols 页面块的 0/1 余弦相似度，返回 (相似度, 两侧是否都非空)"""
+    overlap = (mask[rows] @ mask[cols].T).toarray()
+    norm = np.sqrt(np.outer(sizes[rows], sizes[cols]))
+    nonempty = norm > 0
+    sim = np.divide(overlap, norm, out=np.zeros_like(norm), where=nonempty)
+    return sim, nonempty
 
 
 def _build_similarity_matrix(features: List[Dict], show_progress: bool = False) -> np.ndarray:
@@ -42,6 +121,10 @@ def _build_similarity_matrix(features: List[Dict], show_progress: bool = False)
     使用 __get_max_width_layer 计算每个页面的"有效层数"，
     两个页面之间的 similarity 使用它们层数平均值作为 layer_n。
 
+    similarity 中的向量各维取值均为 1，余弦相似度即交集大小除以两集合大小的几何平均。
+    这里把所有页面编码为稀疏矩阵，按页面"有效层数"分组：两组之间的页面对
+    layer_n 相同，每对分组只需一次稀疏矩阵乘法即可得到整块的交集大小。
+
     Args:
         features: 特征列表。
         show_progress: 是否显示进度条。
@@ -52,29 +135,68 @@ def _build_similarity_matrix(features: List[Dict], show_progress: bool = False)
         return np.zeros((0, 0), dtype=np.float32)
 
     tags_list = [f.get("tags", {}) for f in features]
-    # 对每个页面，计算其最大宽度所在层，用于估计合适的 layer_n
-    layers = [__get_max_width_layer(tags) for tags in tags_list]
+    # 对每个页面，读取其最大宽度所在层，用于估计合适的 layer_n
+    layers = np.array([_max_width_layer(f) for f in features], dtype=np.int64)
+
+    tag_layers = _layered_key_matrix(tags_list)
+    attr_layers = _layered_key_matrix([f.get("attrs", {}) for f in features])
+
+    # 同一 layer_n 的截断结果在不同分组对之间复用
+    masks: Dict[int, Tuple[sparse.csr_matrix, np.ndarray, sparse.csr_matrix, np.ndarray]] = {}
 
+    groups = {int(layer): np.flatnonzero(layers == layer) for layer in np.unique(layers)}
+    group_pairs = [(a, b) for a in groups for b in groups if a <= b]
+
+    k = 0.7  # 与 similarity 默认一致：tags 权重 0.7，attrs 权重 0.3
     sim_mat = np.zeros((n, n), dtype=np.float32)
 
-    # 计算需要执行的相似度计算次数（上三角矩阵）
-    total_comparisons = n * (n - 1) // 2
+    iterator = tqdm(group_pairs, desc="计算相似度矩阵", unit="组") if show_progress else group_pairs
+    for a, b in iterator:
+        # 按 demo 中逻辑：两页的 layer_n 取平均再取整
+        layer_n = (a + b) // 2
+        if layer_n not in masks:
+            masks[layer_n] = _mask_within_layer(tag_layers, layer_n) + _mask_within_layer(attr_layers, layer_n)
+        tag_mask, tag_sizes, attr_mask, attr_sizes = masks[layer_n]
+
+        rows, cols = groups[a], groups[b]
+        tag_sim, has_tags = _cosine_block(tag_mask, tag_sizes, rows, cols)
+        attr_sim, has_attrs = _cosine_block(attr_mask, attr_sizes, rows, cols)
+
+        # 与 similarity 相同的分支：无 tags 记 0，无 attrs 只用 tags 相似度
+        block = np.where(has_tags, np.where(has_attrs, tag_sim * k + attr_sim * (1 - k), tag_sim), 0.0)
+        block = np.round(block, 8)
+        sim_mat[np.ix_(rows, cols)] = block
+        sim_mat[np.ix_(cols, rows)] = block.T
 
-    iterator = tqdm(range(n), desc="计算相似度矩阵", unit="行") if show_progress else range(n)
-    for i in iterator:
-        sim_mat[i, i] = 1.0
-        for j in range(i + 1, n):
-            # 按 demo 中逻辑：两页的 layer_n 取平均再取整
-            layer_n = int((layers[i] + layers[j]) / 2)
-            sim = similarity(features[i], features[j], layer_n)
-            sim_mat[i, j] = sim
-            sim_mat[j, i] = sim
+    np.fill_diagonal(sim_mat, 1.0)
 
     # 数值稳定处理，裁剪在 [0,1] 范围内
     sim_mat = np.clip(sim_mat, 0.0, 1.0)
     return sim_mat
 
 
+def _radius_graph(sim_mat: np.ndarray, eps: float, block_rows: int = 1024) -> sparse.csr_matrix:
+    """将相似度矩阵转为只保留距离 <= eps 的稀疏距离矩阵，供 DBSCAN(metric="precomputed") 使用。
+
+    DBSCAN 只关心 eps 邻域内的点，稠密距离矩阵中绝大部分元素用不到。这里按行分块计算
+    距离 = 1 - similarity（负值裁剪为 0），不再额外分配 n x n 的距离矩阵；
+    距离为 0 的近邻以显式 0 存储，与稠密输入的聚类结果一致。
+    """
+    n = sim_mat.shape[0]
+    rows_list, cols_list, data_list = [], [], []
+    for start in range(0, n, block_rows):
+        dist = np.maximum(1.0 - sim_mat[start:start + block_rows], 0.0)
+        rows, cols = np.nonzero(dist <= eps)
+        rows_list.append(rows + start)
+        cols_list.append(cols)
+        data_list.append(dist[rows, cols])
+
+    return sparse.csr_matrix(
+        (np.concatenate(data_list), (np.concatenate(rows_list), np.concatenate(cols_list))),
+        shape=(n, n),
+    )
+
+
 def cluster_html_layouts(
     html_list: List[str],
     eps: float = 0.05,
@@ -114,10 +236,10 @@ def cluster_html_layouts(
     # 2. 计算相似度矩阵（基于 demo 中的 similarity 调用逻辑）
     sim_mat = _build_similarity_matrix(features, show_progress=show_progress)
 
-    # 3. 将相似度转为"距离"矩阵供 DBSCAN 使用
+    # 3. 将相似度转为"距离"矩阵供 DBSCAN 使用（只保留 eps 邻域内的稀疏距离）
     if show_progress:
         print("执行DBSCAN聚类...")
-    dist_mat = 1.0 - sim_mat
+    dist_mat = _radius_graph(sim_mat, eps)
 
     # 4. 进行 DBSCAN 聚类
     clustering = DBSCAN(eps=eps, min_samples=min_samples, metric="precomputed")
@@ -126,13 +248,17 @@ def cluster_html_layouts(
     # 5. 按簇重组成 HTML 字符串的 list[list]
     clusters: List[List[str]] = []
     unique_labels = sorted(set(labels) - {-1})  # 去掉噪声点 -1
+    # 一次遍历按标签分组，避免每个簇都重新扫描全部样本
+    members: Dict[int, List[str]] = {lbl: [] for lbl in unique_labels}
+    for html, lbl in zip(html_list, labels):
+        if lbl != -1:
+            members[lbl].append(html)
     for lbl in unique_labels:
-        cluster_htmls = [html for html, l in zip(html_list, labels) if l == lbl]
-        clusters.append(cluster_htmls)
+        clusters.append(members[lbl])
 
     if show_progress:
         n_clusters = len(unique_labels)
-        n_noise = list(labels).count(-1)
+        n_noise = int(np.count_nonzero(labels == -1))
         print(f"✓ 聚类完成: {n_clusters} 个簇, {n_noise} 个噪声点")
         print(f"{'='*60}\n")
 
@@ -224,9 +350,8 @@ def cluster_html_layouts_optimized(
         # 自己和自己固定视为完全相似，避免受浮点误差影响
         np.fill_diagonal(sim_mat, 1.0)
 
-        dist_mat = 1.0 - sim_mat
-        # 数值误差可能导致极小的负值，这里保证距离非负
-        dist_mat = np.clip(dist_mat, 0.0, None)
+        # 转为只保留 eps 邻域的稀疏距离矩阵（数值误差导致的极小负距离裁剪为 0）
+        dist_mat = _radius_graph(sim_mat, eps)
         clustering = DBSCAN(eps=eps, min_samples=min_samples, metric="precomputed")
         labels = clustering.fit_predict(dist_mat)
 
@@ -234,9 +359,13 @@ def cluster_html_layouts_optimized(
     # 5. 按簇重组成 HTML 字符串列表
     clusters: List[List[str]] = []
     unique_labels = sorted(set(labels) - {-1})  # 去掉噪声点 -1
+    # 一次遍历按标签分组，避免每个簇都重新扫描全部样本
+    members: Dict[int, List[str]] = {lbl: [] for lbl in unique_labels}
+    for html, lbl in zip(html_list, labels):
+        if lbl != -1:
+            members[lbl].append(html)
     for lbl in unique_labels:
-        cluster_htmls = [html for html, l in zip(html_list, labels) if l == lbl]
-        clusters.append(cluster_htmls)
+        clusters.append(members[lbl])
 
     return labels, sim_mat, clusters
 
@@ -4,12 +4,24 @@
 """
 import json
 import os
+import re
 from pathlib import Path
 from typing import Dict
 from loguru import logger
 from web2json.config.settings import settings
 from langchain_core.tools import tool
 from web2json.prompts.code_generator import CodeGeneratorPrompts
+from web2json.tools.html_simplifier import shorten_html_for_code_gen
+
+# 匹配首尾的 markdown 代码块标记（```python / ```），一次匹配取出代码主体
+_CODE_FENCE_RE = re.compile(r"^(?:```(?:python)?)?(.*?)(?:```)?$", re.DOTALL)
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """先写入同目录临时文件再替换目标文件，避免中途失败留下不完整的文件"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
 
 
 @tool
@@ -51,6 +63,12 @@ def generate_parser_code(
             temperature=settings.code_gen_temperature
         )
 
+        # 截断过长的文本节点，减少 Prompt token，同时让截断长度内容纳更多页面结构
+        try:
+            html_content = shorten_html_for_code_gen(html_content)
+        except Exception as e:
+            logger.warning(f"HTML文本截断失败，使用原始HTML: {e}")
+
         # 使用 Prompt 模块构建提示词
         if round_num == 1:
             prompt = CodeGeneratorPrompts.get_initial_generation_prompt(
@@ -74,23 +92,14 @@ def generate_parser_code(
         # 使用 LLMClient 的 chat_completion 方法（自动记录 token）
         generated_code = llm_client.chat_completion(messages)
 
-        # 清理 markdown 标记
-        generated_code = generated_code.strip()
-
         # 移除 markdown 代码块标记
-        if generated_code.startswith("```python"):
-            generated_code = generated_code[len("```python"):].strip()
-        elif generated_code.startswith("```"):
-            generated_code = generated_code[3:].strip()
-
-        if generated_code.endswith("```"):
-            generated_code = generated_code[:-3].strip()
+        generated_code = _CODE_FENCE_RE.match(generated_code.strip()).group(1).strip()
 
         # 保存生成的代码
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         parser_path = output_path / "generated_parser.py"
-        parser_path.write_text(generated_code, encoding='utf-8')
+        _atomic_write_bytes(parser_path, generated_code.encode('utf-8'))
 
         # 生成配置文件
         config = {
@@ -111,8 +120,7 @@ def generate_parser_code(
             }
         }
         config_path = output_path / "schema.json"
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        _atomic_write_bytes(config_path, json.dumps(config, ensure_ascii=False, indent=2).encode('utf-8'))
 
         if round_num == 1:
             logger.success(f"代码生成完成")
@@ -54,11 +54,16 @@ def get_feature(html_source: str, is_ignore_tag: bool = True) -> Dict:
         dict:
         {
             "tags": {1: ["<body>/div"], 2: [...]},
-            "attrs": {1: ["nav", "content", "footer"], 2: [...]}
+            "attrs": {1: ["nav", "content", "footer"], 2: [...]},
+            "max_width_layer": 3
         }
+        max_width_layer 为 __get_max_width_layer(tags) 的结果，提取时一并算好，聚类时直接读取
     """
     doc = __html_to_valid_element(html_source)
-    return __recursive_extract_tags(doc, is_ignore_tag)
+    feature = __recursive_extract_tags(doc, is_ignore_tag)
+    if feature:
+        feature['max_width_layer'] = __get_max_width_layer(feature['tags'])
+    return feature
 
 
 def __parse_tag_attr(tag_attrs_lst: List[set]) -> Dict:
@@ -223,6 +223,36 @@ def clean_attributes(
     return root
 
 
+def truncate_long_text(
+    root: html.HtmlElement,
+    max_len: int = 200,
+    head_len: int = 100,
+    tail_len: int = 50
+) -> html.HtmlElement:
+    """
+    截断过长的文本节点，只保留首尾部分
+
+    生成解析代码时 LLM 只需要看到文本样例即可定位元素，长文本（正文、描述等）
+    会占用大量 token，并挤占截断长度内可见的页面结构。
+
+    Args:
+        root: HTML 根元素
+        max_len: 超过该长度的文本才会被截断
+        head_len: 保留的开头字符数
+        tail_len: 保留的结尾字符数
+
+    Returns:
+        处理后的 HTML 根元素
+    """
+    for elem in root.iter():
+        if elem.text and len(elem.text) > max_len:
+            elem.text = elem.text[:head_len] + "…" + elem.text[-tail_len:]
+        if elem.tail and len(elem.tail) > max_len:
+            elem.tail = elem.tail[:head_len] + "…" + elem.tail[-tail_len:]
+
+    return root
+
+
 # ============================================
 # 主要精简函数
 # ============================================
@@ -466,3 +496,19 @@ def simplify_html_keep_structure(html_str: str) -> str:
         clean_attrs=True,
         keep_attrs=['class', 'id']
     )
+
+
+def shorten_html_for_code_gen(html_str: str, max_text_len: int = 200) -> str:
+    """
+    为代码生成 Prompt 缩短 HTML：保留全部结构和属性，只截断过长的文本
+
+    Args:
+        html_str: 精简后的 HTML 字符串
+        max_text_len: 文本节点的最大长度
+
+    Returns:
+        缩短后的 HTML 字符串
+    """
+    root = html_to_element(html_str)
+    truncate_long_text(root, max_len=max_text_len)
+    return element_to_html(root)
@@ -4,6 +4,7 @@ Schema提取和合并工具
 """
 import json
 import re
+from functools import lru_cache
 from typing import Dict, List
 from loguru import logger
 from langchain_core.tools import tool
@@ -14,6 +15,24 @@ from web2json.config.settings import settings
 from web2json.prompts.schema_extraction import SchemaExtractionPrompts
 from web2json.prompts.schema_merge import SchemaMergePrompts
 
+# 解析/修复模型响应 JSON 所用的正则，模块加载时预编译
+_JSON_BLOCK_RE = re.compile(r"```json\s*(.*?)\s*```", re.DOTALL)
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+_MISSING_COMMA_RE = re.compile(r'"\s*\n\s*"')
+_MISSING_OBJECT_COMMA_RE = re.compile(r'}\s*\n\s*"')
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+
+
+@lru_cache(maxsize=4)
+def _get_chat_model(model: str, temperature: float, api_key: str, base_url: str) -> ChatOpenAI:
+    """按配置缓存 ChatOpenAI 实例，多次调用复用同一 HTTP 连接池"""
+    return ChatOpenAI(
+        model=model,
+        api_key=api_key,
+        base_url=base_url,
+        temperature=temperature
+    )
+
 
 def _parse_llm_response(response: str) -> Dict:
     """解析模型响应中的JSON"""
@@ -23,19 +42,19 @@ def _parse_llm_response(response: str) -> Dict:
     def try_fix_json(json_str: str) -> str:
         """尝试修复常见的JSON格式问题"""
         # 修复：缺少逗号（对象内）
-        json_str = re.sub(r'"\s*\n\s*"', '",\n  "', json_str)
+        json_str = _MISSING_COMMA_RE.sub('",\n  "', json_str)
 
         # 修复：对象后缺少逗号
-        json_str = re.sub(r'}\s*\n\s*"', '},\n  "', json_str)
+        json_str = _MISSING_OBJECT_COMMA_RE.sub('},\n  "', json_str)
 
         # 修复：尾随逗号
-        json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
+        json_str = _TRAILING_COMMA_RE.sub(r'\1', json_str)
 
         return json_str
 
     try:
         # 尝试提取JSON代码块
-        json_match = re.search(r"```json\s*(.*?)\s*```", response, re.DOTALL)
+        json_match = _JSON_BLOCK_RE.search(response)
         if json_match:
             json_str = json_match.group(1)
             try:
@@ -51,7 +70,7 @@ def _parse_llm_response(response: str) -> Dict:
                     raise
 
         # 尝试提取普通JSON
-        match = re.search(r"\{.*\}", response, re.DOTALL)
+        match = _JSON_OBJECT_RE.search(response)
         if match:
             json_str = match.group()
             try:
@@ -101,11 +120,11 @@ def extract_schema_from_html(html_content: str) -> Dict:
         prompt = SchemaExtractionPrompts.get_html_extraction_prompt()
 
         # 2. 调用LLM
-        model = ChatOpenAI(
-            model=settings.default_model,
-            api_key=os.getenv("OPENAI_API_KEY"),
-            base_url=os.getenv("OPENAI_API_BASE"),
-            temperature=0.1
+        model = _get_chat_model(
+            settings.default_model,
+            0.1,
+            os.getenv("OPENAI_API_KEY"),
+            os.getenv("OPENAI_API_BASE")
         )
 
         messages = [
@@ -277,11 +296,11 @@ def merge_multiple_schemas(schemas: List[Dict]) -> Dict:
         prompt = SchemaMergePrompts.get_merge_multiple_schemas_prompt(schemas)
 
         # 2. 调用LLM
-        model = ChatOpenAI(
-            model=settings.default_model,
-            api_key=os.getenv("OPENAI_API_KEY"),
-            base_url=os.getenv("OPENAI_API_BASE"),
-            temperature=0.1
+        model = _get_chat_model(
+            settings.default_model,
+            0.1,
+            os.getenv("OPENAI_API_KEY"),
+            os.getenv("OPENAI_API_BASE")
         )
 
         messages = [
@@ -332,10 +351,10 @@ def enrich_schema_with_xpath(schema_template: Dict, html_content: str) -> Dict:
         # 2. 构建消息
         # 确保中文字段名正确序列化
         try:
-            schema_str = json.dumps(schema_template, ensure_ascii=False, indent=2)
+            schema_str = json.dumps(schema_template, ensure_ascii=False, separators=(",", ":"))
         except Exception as e:
             logger.warning(f"JSON序列化失败，尝试使用ASCII模式: {e}")
-            schema_str = json.dumps(schema_template, ensure_ascii=True, indent=2)
+            schema_str = json.dumps(schema_template, ensure_ascii=True, separators=(",", ":"))
 
         user_message = f"{prompt}\n\n## Schema模板\n\n```json\n{schema_str}\n```\n\n## HTML内容\n\n```html\n{html_content[:50000]}\n```"
 
@@ -347,11 +366,11 @@ def enrich_schema_with_xpath(schema_template: Dict, html_content: str) -> Dict:
             logger.warning(f"消息编码处理失败: {e}")
 
         # 3. 调用LLM
-        model = ChatOpenAI(
-            model=settings.default_model,
-            api_key=os.getenv("OPENAI_API_KEY"),
-            base_url=os.getenv("OPENAI_API_BASE"),
-            temperature=0.1
+        model = _get_chat_model(
+            settings.default_model,
+            0.1,
+            os.getenv("OPENAI_API_KEY"),
+            os.getenv("OPENAI_API_BASE")
         )
 
         messages = [
@@ -3,6 +3,7 @@
 使用 DrissionPage 捕获本地HTML文件截图
 """
 from DrissionPage import ChromiumPage, ChromiumOptions
+import atexit
 import os
 from datetime import datetime
 from pathlib import Path
@@ -39,9 +40,15 @@ def _get_or_create_browser(width: int = 1920, height: int = 1080) -> ChromiumPag
         co.set_argument('--no-sandbox')  # 提升启动速度
         co.set_argument('--disable-gpu')  # 禁用GPU加速（截图不需要）
         co.set_argument('--disable-software-rasterizer')
+        co.set_argument('--disable-background-networking')
+        co.set_argument('--disable-background-timer-throttling')
+        co.set_argument('--disable-renderer-backgrounding')
 
-        # 可选：禁用图片加载（如果布局不依赖图片）
-        # co.set_argument('--blink-settings=imagesEnabled=false')
+        # 可选：禁用图片和远程字体加载（布局和文字不依赖图片时）
+        if not settings.screenshot_load_images:
+            co.set_argument('--blink-settings=imagesEnabled=false')
+            co.set_argument('--disable-remote-fonts')
+            co.set_pref('profile.managed_default_content_settings.images', 2)
 
         _browser_instance = ChromiumPage(addr_or_opts=co)
         _browser_instance.set.window.size(width, height)
@@ -58,6 +65,10 @@ def close_browser():
         _browser_instance = None
 
 
+# 进程退出时关闭复用的浏览器，避免残留 Chromium 进程
+atexit.register(close_browser)
+
+
 @tool
 def capture_html_file_screenshot(
     html_file_path: str,
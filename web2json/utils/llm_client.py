@@ -2,10 +2,13 @@
 LLM客户端封装 - 使用 LangChain 1.0
 支持基于场景的模型配置和 Token 追踪
 """
+import atexit
 import os
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Literal
 
+import httpx
 import tiktoken
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
@@ -24,6 +27,14 @@ if not os.getenv("OPENAI_API_KEY"):
 # 定义场景类型
 ScenarioType = Literal["default", "code_gen", "vision", "agent"]
 
+# 场景 -> settings 中对应的 (模型字段, 温度字段)；settings 在导入时已一次性读取环境变量
+_SCENARIO_FIELDS: Dict[str, tuple] = {
+    "default": ("default_model", "default_temperature"),
+    "code_gen": ("code_gen_model", "code_gen_temperature"),
+    "vision": ("vision_model", "vision_temperature"),
+    "agent": ("agent_model", "agent_temperature"),
+}
+
 
 class LLMClient:
     """LLM客户端封装类 - 基于 LangChain 1.0
@@ -41,19 +52,27 @@ class LLMClient:
     _global_total_completion_tokens = 0
     _global_total_tokens = 0
     _global_request_count = 0
+    # 并发调用时保护 token 统计
+    _usage_lock = threading.Lock()
     
-    # 单例字典，按 (model, api_base) 作为键
+    # 单例字典，按 (model, api_base, temperature, api_key) 作为键
     _instances: Dict[tuple, "LLMClient"] = {}
 
+    # 所有 ChatOpenAI 共享的 HTTP 连接池，保持 keep-alive，避免每个客户端各自建立 TCP/TLS 连接
+    _http_client: Optional[httpx.Client] = None
+    # 多个聚类线程可能同时创建客户端，连接池的创建与关闭需加锁
+    _http_client_lock = threading.Lock()
+
     def __new__(cls, api_key: Optional[str] = None, api_base: Optional[str] = None,
                 model: Optional[str] = None, temperature: float = 0.3):
         """使用单例模式，确保相同配置的客户端共享实例"""
         # 获取实际的配置值（优先使用settings）
+        actual_api_key = api_key or settings.openai_api_key
         actual_api_base = api_base or settings.openai_api_base
         actual_model = model or settings.default_model
 
-        # 使用 (model, api_base) 作为键
-        instance_key = (actual_model, actual_api_base)
+        # 温度和密钥不同的客户端不能共用同一个 ChatOpenAI
+        instance_key = (actual_model, actual_api_base, temperature, actual_api_key)
 
         if instance_key not in cls._instances:
             instance = super().__new__(cls)
@@ -98,12 +117,33 @@ class LLMClient:
             model=self.model,
             api_key=self.api_key,
             base_url=self.api_base,
-            temperature=self.temperature
+            temperature=self.temperature,
+            http_client=self._get_http_client()
         )
 
         self._initialized = True
         logger.info(f"LLM客户端初始化完成 - 模型: {self.model}, Base: {self.api_base}")
 
+    @classmethod
+    def _get_http_client(cls) -> httpx.Client:
+        """获取共享的 HTTP 连接池（首次调用时创建）"""
+        with cls._http_client_lock:
+            if cls._http_client is None:
+                cls._http_client = httpx.Client(
+                    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                    timeout=httpx.Timeout(600.0, connect=5.0),
+                )
+            return cls._http_client
+
+    @classmethod
+    def close_pool(cls) -> None:
+        """关闭共享连接池并清空客户端实例（已注册为进程退出时执行）"""
+        with cls._http_client_lock:
+            if cls._http_client is not None:
+                cls._http_client.close()
+                cls._http_client = None
+            cls._instances.clear()
+
     @classmethod
     def from_settings(cls, settings, model: Optional[str] = None, temperature: Optional[float] = None):
         """从Settings对象创建LLMClient
@@ -144,39 +184,17 @@ class LLMClient:
             >>> # 视觉理解场景
             >>> llm = LLMClient.for_scenario("vision")
         """
-        # 从 settings 获取配置
-        api_key = settings.openai_api_key
-        api_base = settings.openai_api_base
-
-        # 根据场景选择配置（使用 settings）
-        scenario_configs = {
-            "default": {
-                "model": settings.default_model,
-                "temperature": settings.default_temperature
-            },
-            "code_gen": {
-                "model": settings.code_gen_model,
-                "temperature": settings.code_gen_temperature
-            },
-            "vision": {
-                "model": settings.vision_model,
-                "temperature": settings.vision_temperature
-            },
-            "agent": {
-                "model": settings.agent_model,
-                "temperature": settings.agent_temperature
-            }
-        }
+        # 根据场景选择配置（使用 settings，未知场景回退到 default）
+        model_field, temperature_field = _SCENARIO_FIELDS.get(scenario, _SCENARIO_FIELDS["default"])
+        model = getattr(settings, model_field)
 
-        config = scenario_configs.get(scenario, scenario_configs["default"])
-
-        logger.info(f"创建 {scenario} 场景的LLM客户端 - 模型: {config['model']}")
+        logger.info(f"创建 {scenario} 场景的LLM客户端 - 模型: {model}")
 
         return cls(
-            api_key=api_key,
-            api_base=api_base,
-            model=config["model"],
-            temperature=config["temperature"]
+            api_key=settings.openai_api_key,
+            api_base=settings.openai_api_base,
+            model=model,
+            temperature=getattr(settings, temperature_field)
         )
 
     def count_tokens(self, text: str) -> int:
@@ -200,21 +218,25 @@ class LLMClient:
             completion_tokens: 输出 token 数
         """
         # 更新全局统计
-        LLMClient._global_total_input_tokens += input_tokens
-        LLMClient._global_total_completion_tokens += completion_tokens
-        LLMClient._global_total_tokens = (
-            LLMClient._global_total_input_tokens + 
-            LLMClient._global_total_completion_tokens
-        )
-        LLMClient._global_request_count += 1
+        with LLMClient._usage_lock:
+            LLMClient._global_total_input_tokens += input_tokens
+            LLMClient._global_total_completion_tokens += completion_tokens
+            LLMClient._global_total_tokens = (
+                LLMClient._global_total_input_tokens + 
+                LLMClient._global_total_completion_tokens
+            )
+            LLMClient._global_request_count += 1
+            cumulative_input = LLMClient._global_total_input_tokens
+            cumulative_completion = LLMClient._global_total_completion_tokens
+            cumulative_total = LLMClient._global_total_tokens
 
         # 按照指定格式打印 token 消耗
         logger.info(
             f"Token usage: Input={input_tokens}, Completion={completion_tokens}, "
-            f"Cumulative Input={LLMClient._global_total_input_tokens}, "
-            f"Cumulative Completion={LLMClient._global_total_completion_tokens}, "
+            f"Cumulative Input={cumulative_input}, "
+            f"Cumulative Completion={cumulative_completion}, "
             f"Total={input_tokens + completion_tokens}, "
-            f"Cumulative Total={LLMClient._global_total_tokens}"
+            f"Cumulative Total={cumulative_total}"
         )
 
     def chat_completion(
@@ -348,3 +370,7 @@ class LLMClient:
         cls._global_total_tokens = 0
         cls._global_request_count = 0
         logger.info("Token使用统计已重置")
+
+
+# 进程退出时关闭共享连接池
+atexit.register(LLMClient.close_pool)